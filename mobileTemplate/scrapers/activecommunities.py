@@ -0,0 +1,190 @@
+# activecommunities.py
+"""
+Browserless fetch engine for ActiveCommunities (ActiveNet) activity search.
+
+The Burnaby list page is rendered from a paginated JSON endpoint; calling it directly
+returns the same data as the infinite-scroll cards in a few HTTP round trips.
+
+The response shape below is assumed from the list page's requests and has not yet been
+checked against a captured response, which is why the scraper falls back to Selenium
+whenever the endpoint fails or yields no events:
+
+    {"headers": {"page_info": {"total_page": 5, ...}},
+     "body": {"activity_items": [{"name", "number", "ages", "date_range_start" (or "date_range"),
+                                  "time_range", "location": {"label"}, "openings",
+                                  "detail_url" (or "action_link": {"href"}), ...}]}}
+
+The pages under fixtures/burnaby are synthetic: they were generated from
+assets/data/burnaby-drop-in-sessions.json in that shape, so replaying them exercises the
+parser offline but says nothing about the real endpoint. Replace them with captured
+responses once the schema has been confirmed.
+"""
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import utils
+from event_record import Event
+
+SITE_URL = "https://anc.ca.apm.activecommunities.com/burnaby"
+LIST_URL = f"{SITE_URL}/rest/activities/list?locale=en-US"
+PAGE_SIZE = 20
+
+# Synthetic response pages used by `iter_pages(fixture_dir=...)` (see above)
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "burnaby")
+
+
+def build_search_body(keyword):
+    """Request body matching the list page's `activity_keyword=volleyball&viewMode=list` search."""
+    return {
+        "activity_search_pattern": {
+            "activity_select_param": 2,
+            "activity_keyword": keyword,
+            "skills": [],
+            "time_after_str": "",
+            "days_of_week": None,
+            "activity_category_ids": [],
+            "date_before": "",
+            "min_age": None,
+            "date_after": "",
+            "activity_type_ids": [],
+            "site_ids": [],
+            "for_map": False,
+            "geographic_area_ids": [],
+            "season_ids": [],
+            "activity_department_ids": [],
+            "activity_other_category_ids": [],
+            "child_season_ids": [],
+            "activity_keyword_hint": "",
+            "center_ids": [],
+            "instructor_ids": [],
+            "max_age": None,
+            "time_before_str": "",
+        },
+        "activity_transfer_pattern": {},
+    }
+
+
+def page_headers(page_number):
+    # The endpoint takes its paging parameters as a JSON-encoded header
+    page_info = {"order_by": "", "page_number": page_number, "total_records_per_page": PAGE_SIZE}
+    return {"page_info": json.dumps(page_info), "Accept": "application/json"}
+
+
+def fetch_page(session, page_number, keyword="volleyball"):
+    response = session.post(
+        LIST_URL,
+        json=build_search_body(keyword),
+        headers=page_headers(page_number),
+        timeout=15,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def fixture_path(fixture_dir, page_number):
+    return os.path.join(fixture_dir, f"activities-page-{page_number}.json")
+
+
+def load_fixture_page(fixture_dir, page_number):
+    with open(fixture_path(fixture_dir, page_number)) as f:
+        return json.load(f)
+
+
+def total_pages(payload):
+    page_info = (payload.get("headers") or {}).get("page_info") or {}
+    return int(page_info.get("total_page") or 1)
+
+
+def iter_pages(session=None, keyword="volleyball", workers=4, fixture_dir=None):
+    """
+    Yield every result page in order, each as soon as it has arrived. Page 1 tells us how many
+    pages exist; the rest are fetched concurrently over the pooled session (or read from `fixture_dir`).
+    """
+    if fixture_dir:
+        get_page = lambda n: load_fixture_page(fixture_dir, n)
+    else:
+        get_page = lambda n: fetch_page(session, n, keyword)
+
+    first = get_page(1)
+    yield first
+    remaining = range(2, total_pages(first) + 1)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(get_page, remaining)
+
+
+def clean_ages(ages):
+    """Turn "19 yrs +" / "Age at least 13 yrs but less than 19 yrs" into the app's "19+" / "13yrs - 19yrs"."""
+    if not ages:
+        return "No age group"
+    match = re.search(r"at least (\d+) yrs but less than (\d+) yrs", ages)
+    if match:
+        return f"{match.group(1)}yrs - {match.group(2)}yrs"
+    return ages.strip().replace("yrs", "").replace(" ", "")
+
+
+def parse_activity_item(item):
+    """Map one `activity_items` entry to the same Event record the Selenium scraper produces."""
+    # The endpoint may send explicit nulls, so `or` rather than .get defaults
+    title = (item.get("name") or "").strip()
+    eventLink = item.get("detail_url") or (item.get("action_link") or {}).get("href")
+    if not title or not eventLink:
+        return None
+
+    location = (item.get("location") or {}).get("label") or "No location"
+
+    # "39", "Full" or "Openings 39" - keep the last word like the card parser does
+    openings_text = str(item.get("openings") or "Full").strip()
+    openings = openings_text.split()[-1]
+
+    # Date, day of week, venue type, level and status are filled in by utils.normalize_events
+    raw_date = item.get("date_range_start") or item.get("date_range") or "No date"
+    raw_time = item.get("time_range") or "No time range"
+
+    return Event(
+        title=title,
+        eventID=str(item.get("number") or "").replace("#", ""),
+        location=location,
+        city='Burnaby',
+        eventLink=eventLink,
+        venueType=None,
+        category='Drop-in',
+        level=None,
+        ages=clean_ages(item.get("ages")),
+        openings=openings,
+        status=None,
+        eventDate=raw_date,
+        eventTime=raw_time.strip().upper(),
+        dayOfWeek=None,
+        fee="Pay in person"
+    )
+
+
+def parse_page(page):
+    """Events of one result page, not yet normalized"""
+    events = []
+    for item in (page.get("body") or {}).get("activity_items") or []:
+        event = parse_activity_item(item)
+        if event:
+            events.append(event)
+    return events
+
+
+def fetch_volleyball_events(session=None, workers=4, fixture_dir=None, sink=None):
+    """
+    Fetch and parse every volleyball activity. Raises if the endpoint can't be used.
+    Each page's events are normalized and handed to `sink` (an NDJSONSink) as soon as it arrives.
+    """
+    if session is None and not fixture_dir:
+        from http_pool import make_session  # requests is only loaded when something is fetched
+        session = make_session(pool_size=workers)
+
+    events = []
+    for page in iter_pages(session, workers=workers, fixture_dir=fixture_dir):
+        page_events = utils.normalize_events(parse_page(page), source="burnaby")
+        if sink:
+            sink.write_many(page_events)
+        events += page_events
+    return events
@@ -0,0 +1,116 @@
+# bench_normalize.py
+"""
+Micro-benchmark of event normalization: the original per-field helpers vs normalize.py.
+
+Usage: python bench_normalize.py [--repeat 20] [--scale 10]
+
+Runs over the checked-in assets/data/*-drop-in-sessions.json (repeated --scale times,
+as a longer scrape window would) and reports the per-event cost of each path.
+"""
+import argparse
+import copy
+import statistics
+import time
+from datetime import datetime
+
+import html_fixtures
+import normalize
+
+
+# --- The helpers as they were in utils.py before normalize.py, kept as the baseline ---
+
+def legacy_standardize_date(date_str):
+    formats = ["%B %d, %Y", "%b %d, %Y", "%d-%b-%Y", "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y"]
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return date_str
+
+
+def legacy_get_day_of_week(date_str):
+    try:
+        return datetime.strptime(legacy_standardize_date(date_str), "%Y-%m-%d").strftime("%A")
+    except Exception:
+        return "Unknown"
+
+
+def legacy_get_venue_type_from_location(location):
+    location_lower = location.lower()
+    if "centre" in location_lower or "complex" in location_lower or "gymnasium" in location_lower or "gym" in location_lower:
+        return "Indoor"
+    elif "beach" in location_lower or "sand" in location_lower or "banks" in location_lower:
+        return "Beach"
+    elif "grass" in location_lower:
+        return "Grass"
+    return "Not Specified"
+
+
+def legacy_get_status_from_openings(openings):
+    openings = openings.lower()
+    return "Full" if openings == "0" or "full" in openings else "Open"
+
+
+def legacy_get_level_from_title(title):
+    title_lower = title.lower()
+    for level in ("Beginner", "Intermediate", "Advanced"):
+        if level.lower() in title_lower:
+            return level
+    return "All Levels"
+
+
+def legacy_normalize(events):
+    for event in events:
+        event["eventDate"] = legacy_standardize_date(event["eventDate"])
+        event["dayOfWeek"] = legacy_get_day_of_week(event["eventDate"])
+        event["venueType"] = legacy_get_venue_type_from_location(event["location"])
+        event["level"] = legacy_get_level_from_title(event["title"])
+        event["status"] = legacy_get_status_from_openings(event["openings"])
+    return events
+
+
+def raw_events(scale):
+    """Scraped events as they look before normalization (dates in the sites' own formats)"""
+    events = []
+    for city in ("burnaby", "newwest"):
+        for event in html_fixtures.load_sessions(city):
+            event = dict(event)
+            event["eventDate"] = datetime.strptime(event["eventDate"], "%Y-%m-%d").strftime("%B %d, %Y")
+            events.append(event)
+    return events * scale
+
+
+def bench(name, normalize_fn, events, repeat):
+    timings = []
+    for _ in range(repeat):
+        batch = copy.deepcopy(events)
+        start = time.perf_counter()
+        normalize_fn(batch)
+        timings.append(time.perf_counter() - start)
+    seconds = statistics.median(timings)
+    print(f"  {name:<28} {seconds * 1000:8.2f} ms  {seconds / len(events) * 1e6:6.2f} us/event")
+    return seconds, batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event normalization.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=10)
+    args = parser.parse_args()
+
+    events = raw_events(args.scale)
+    print(f"{len(events)} events")
+
+    legacy_seconds, legacy_batch = bench("legacy per-field helpers", legacy_normalize, events, args.repeat)
+    fast_seconds, fast_batch = bench("normalize.normalize_events", normalize.normalize_events, events, args.repeat)
+
+    assert legacy_batch == fast_batch, "normalize.py output differs from the legacy helpers"
+    print(f"  speedup: {legacy_seconds / fast_seconds:.1f}x")
+
+    for name, info in normalize.cache_info().items():
+        print(f"  {name:<10} cache: {info.hits} hits, {info.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
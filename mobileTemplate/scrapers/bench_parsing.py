@@ -0,0 +1,64 @@
+# bench_parsing.py
+"""
+Benchmark the list-page parser backends against the offline HTML fixtures.
+
+Usage: python bench_parsing.py [--repeat 20] [--scale 1] [--backends lxml html.parser]
+
+--scale N repeats every card N times to simulate a wider date window / more cities.
+Regenerate the fixtures with `python html_fixtures.py` after the JSON data changes.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import html_fixtures
+import parsing
+
+PAGES = {
+    "burnaby": parsing.parse_burnaby_cards,
+    "newwest": parsing.parse_newwest_sessions,
+}
+
+
+def load_page(city, scale):
+    if scale == 1:
+        with open(os.path.join(html_fixtures.FIXTURE_DIR, city, "list.html"), encoding="utf-8") as f:
+            return f.read()
+    events = html_fixtures.load_sessions(city) * scale
+    if city == "burnaby":
+        return html_fixtures.render_burnaby_list(events)
+    return html_fixtures.render_newwest_list(events)
+
+
+def time_parse(parse, page_html, backend, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cards = parse(page_html, backend)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(cards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list-page parser backends.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--backends", nargs="+", default=parsing.available_backends(), choices=parsing.BACKENDS)
+    args = parser.parse_args()
+
+    for city, parse in PAGES.items():
+        page_html = load_page(city, args.scale)
+        print(f"{city}: {len(page_html) / 1024:.0f} KB page")
+
+        results = {backend: time_parse(parse, page_html, backend, args.repeat) for backend in args.backends}
+        baseline = results.get("html.parser", (None, 0))[0]
+
+        for backend, (seconds, cards) in results.items():
+            speedup = f"{baseline / seconds:5.1f}x" if baseline else "    -"
+            per_card = seconds / cards * 1e6 if cards else 0
+            print(f"  {backend:<12} {seconds * 1000:8.2f} ms/page  {per_card:7.1f} us/card  {speedup}  ({cards} cards)")
+
+
+if __name__ == "__main__":
+    main()
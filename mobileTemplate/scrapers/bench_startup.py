@@ -0,0 +1,103 @@
+# bench_startup.py
+"""
+Startup-time benchmark for the scrapers' --parse-only path.
+
+Every run starts a fresh interpreter that imports a scraper module and parses its saved list
+page from the fixtures, the way `python burnaby_drop_in_scraper.py --parse-only list.html`
+does. Reported per city: median wall time of the whole process, of the import alone and of the
+parse, and any browser/HTTP library the import pulled in.
+
+Exits non-zero if Selenium, webdriver_manager or requests got loaded, or the median process
+time is over --budget-ms, so an eager import creeping back in gets noticed.
+
+Usage: python bench_startup.py [--repeat 10] [--budget-ms 500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import html_fixtures
+
+SCRAPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODULES = {
+    "burnaby": "burnaby_drop_in_scraper",
+    "newwest": "newwest_drop_in_scraper",
+}
+
+# Only the scrape paths may load these
+HEAVY_MODULES = ("selenium", "webdriver_manager", "requests")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module} as scraper
+imported = time.perf_counter()
+events = scraper.parse_saved_page({path!r})
+parsed = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "parse": parsed - imported,
+    "events": len(events),
+    "loaded": sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r})),
+}}))
+"""
+
+# What importing a scraper used to cost: every library loaded up front
+EAGER_PROBE = "import selenium.webdriver, selenium.webdriver.support.ui, requests, bs4"
+
+
+def run_probe(code):
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], cwd=SCRAPERS_DIR, check=True,
+                            capture_output=True, text=True).stdout
+    return time.perf_counter() - start, output
+
+
+def time_city(city, repeat):
+    path = os.path.join(html_fixtures.FIXTURE_DIR, city, "list.html")
+    code = PROBE.format(module=MODULES[city], path=path, heavy=HEAVY_MODULES)
+    totals, imports, parses = [], [], []
+    for _ in range(repeat):
+        seconds, output = run_probe(code)
+        result = json.loads(output.strip().splitlines()[-1])
+        totals.append(seconds)
+        imports.append(result["import"])
+        parses.append(result["parse"])
+    return statistics.median(totals), statistics.median(imports), statistics.median(parses), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark how fast a --parse-only run starts.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=500, help="fail if a median run takes longer")
+    args = parser.parse_args()
+
+    baseline = statistics.median(run_probe("pass")[0] for _ in range(args.repeat))
+    print(f"bare interpreter       {baseline * 1000:7.1f} ms")
+    try:
+        eager = statistics.median(run_probe(EAGER_PROBE)[0] for _ in range(args.repeat))
+        print(f"eager library imports  {eager * 1000:7.1f} ms  (what every scraper import used to pay)")
+    except subprocess.CalledProcessError:
+        print("eager library imports        -  (Selenium / requests not installed)")
+
+    ok = True
+    for city in MODULES:
+        total, imported, parsed, result = time_city(city, args.repeat)
+        loaded = ", ".join(result["loaded"]) or "none"
+        print(f"{city:<8} {total * 1000:7.1f} ms/run  (import {imported * 1000:6.1f} ms, "
+              f"parse {parsed * 1000:6.1f} ms, {result['events']} events)  heavy modules loaded: {loaded}")
+        if result["loaded"] or total * 1000 > args.budget_ms:
+            ok = False
+
+    if not ok:
+        print(f"FAILED: a parse-only run loaded a heavy module or took over {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+# benchmark.py
+"""
+Offline scrape benchmark and regression check.
+
+Replays the fixtures (fixtures/burnaby/activities-page-*.json and list.html,
+fixtures/newwest/list.html and details/*.html) either through a local HTTP stand-in for the
+booking sites (--mode http, the default) or straight from disk (--mode file), and runs each
+scraper's fetch / parse / normalize path against them:
+
+    burnaby-api     ActiveCommunities JSON pages -> activecommunities.parse_page -> normalize
+    burnaby-cards   list.html -> parsing.parse_burnaby_cards -> build_event -> normalize (Selenium path)
+    newwest         list.html -> build_event, detail pages -> perfectmind.parse_details_page -> normalize
+    engine          both cities end to end through engine.py (http mode only)
+    newwest-browser get_details_and_return on every detail page in Chrome (only with --browser)
+
+Each scenario runs in its own process and reports events/sec, peak RSS, per-stage latency and
+whether its output still matches assets/data. Results are written to --output as JSON; with
+--baseline, a scenario that got slower than --tolerance or stopped matching fails the run.
+
+The fixtures are synthetic, not saved snapshots of the live sites: html_fixtures.py renders
+them from assets/data/*.json with markup rebuilt from the scrapers' own selectors (and the
+Burnaby JSON pages were generated the same way, see activecommunities.py). The match check
+therefore only catches parser and normalization drift against our own markup; it can't tell
+when the real pages change. Saved copies of the live PerfectMind list and detail pages
+should replace fixtures/newwest once they can be captured.
+
+Usage: python benchmark.py [--mode http|file] [--repeat 5] [--output benchmark-results.json]
+                           [--baseline old-results.json] [--tolerance 0.25] [--browser]
+
+Regenerate the HTML fixtures with `python html_fixtures.py` after the JSON data changes.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import get_context
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from requests.adapters import HTTPAdapter
+
+import activecommunities
+import html_fixtures
+import parsing
+import perfectmind
+import utils
+from event_record import to_json
+from http_pool import make_session
+
+FIXTURE_DIR = html_fixtures.FIXTURE_DIR
+DETAILS_DIR = os.path.join(FIXTURE_DIR, "newwest", "details")
+
+# Live hosts the stand-in answers for
+HOSTS = ("https://anc.ca.apm.activecommunities.com", html_fixtures.NEWWEST_BASE_URL)
+
+
+# --- local stand-in for the booking sites ---
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def send_file(self, path, content_type):
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        # ActiveCommunities search: the page number comes in the page_info header
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        page_number = json.loads(self.headers.get("page_info") or "{}").get("page_number", 1)
+        self.send_file(activecommunities.fixture_path(activecommunities.FIXTURE_DIR, page_number), "application/json")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if "classId" in parse_qs(url.query):  # PerfectMind class detail page
+            path = os.path.join(DETAILS_DIR, html_fixtures.detail_fixture_name(self.path))
+        else:
+            path = os.path.join(FIXTURE_DIR, url.path.lstrip("/"))
+        self.send_file(path, "text/html; charset=utf-8")
+
+
+@contextmanager
+def fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class StandInAdapter(HTTPAdapter):
+    """Sends requests for the live booking sites to the local stand-in instead"""
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def send(self, request, **kwargs):
+        for host in HOSTS:
+            if request.url.startswith(host):
+                request.url = self.base_url + request.url[len(host):]
+        return super().send(request, **kwargs)
+
+
+def route_to_stand_in(session, base_url, pool_size=8):
+    adapter = StandInAdapter(base_url, pool_connections=pool_size, pool_maxsize=pool_size)
+    for host in HOSTS:
+        session.mount(host, adapter)
+    session.mount(base_url, adapter)
+    return session
+
+
+# --- measurement ---
+
+class StageTimer:
+    def __init__(self):
+        self.samples = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, []).append(time.perf_counter() - start)
+
+    def summary(self):
+        stages = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            stages[name] = {
+                "calls": len(samples),
+                "total_ms": round(sum(samples) * 1000, 3),
+                "p50_ms": round(statistics.median(ordered) * 1000, 3),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+            }
+        return stages
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def matches(events, cities):
+    """Same events as the cities' checked-in JSON (which the fixtures were rendered from), ignoring order"""
+    expected = [event for city in cities for event in html_fixtures.load_sessions(city)]
+    as_json = lambda items: sorted(json.dumps(item, sort_keys=True, default=to_json) for item in items)
+    return as_json(events) == as_json(expected)
+
+
+def load_scraper(city):
+    import orchestrator
+    return orchestrator.load_scraper(city)
+
+
+def fetcher(mode, base_url):
+    """get(url) -> text, from the stand-in or the fixture files"""
+    if mode == "file":
+        def get(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        return get
+
+    session = route_to_stand_in(make_session(pool_size=8, retries=0), base_url)
+
+    def get(url):
+        response = session.get(url, timeout=15)
+        response.raise_for_status()
+        return response.text
+    return get
+
+
+@contextmanager
+def no_browser(timeout=None):
+    yield None
+
+
+# --- scenarios: each returns (events, the cities whose JSON they should reproduce) ---
+
+def bench_burnaby_api(mode, base_url, timer):
+    if mode == "file":
+        get_page = lambda n: activecommunities.load_fixture_page(activecommunities.FIXTURE_DIR, n)
+    else:
+        session = route_to_stand_in(make_session(pool_size=4, retries=0), base_url)
+        get_page = lambda n: activecommunities.fetch_page(session, n)
+
+    with timer.stage("fetch"):
+        pages = [get_page(1)]
+    for n in range(2, activecommunities.total_pages(pages[0]) + 1):
+        with timer.stage("fetch"):
+            pages.append(get_page(n))
+
+    events = []
+    for page in pages:
+        with timer.stage("parse"):
+            events += activecommunities.parse_page(page)
+    with timer.stage("normalize"):
+        utils.normalize_events(events, source="burnaby")
+    return events, ["burnaby"]
+
+
+def bench_burnaby_cards(mode, base_url, timer):
+    scraper = load_scraper("burnaby")
+    get = fetcher(mode, base_url)
+    location = os.path.join(FIXTURE_DIR, "burnaby", "list.html") if mode == "file" else f"{base_url}/burnaby/list.html"
+
+    with timer.stage("fetch"):
+        page = get(location)
+    with timer.stage("parse"):
+        events = [scraper.build_event(card) for card in parsing.parse_burnaby_cards(page)]
+    with timer.stage("normalize"):
+        utils.normalize_events(events, source="burnaby")
+    return events, ["burnaby"]
+
+
+def bench_newwest(mode, base_url, timer):
+    scraper = load_scraper("newwest")
+    get = fetcher(mode, base_url)
+    location = os.path.join(FIXTURE_DIR, "newwest", "list.html") if mode == "file" else f"{base_url}/newwest/list.html"
+
+    with timer.stage("fetch"):
+        page = get(location)
+    with timer.stage("parse"):
+        events = [event for event in map(scraper.build_event, parsing.parse_newwest_sessions(page)) if event]
+
+    for event in events:
+        if mode == "file":
+            location = os.path.join(DETAILS_DIR, html_fixtures.detail_fixture_name(event["eventLink"]))
+        else:
+            location = event["eventLink"]
+        with timer.stage("fetch"):
+            body = get(location)
+        with timer.stage("parse"):
+            ages, fee, eventDate, eventTime = perfectmind.parse_details_page(body)
+        event.update({'ages': ages, 'eventDate': eventDate, 'eventTime': eventTime, 'fee': fee})
+
+    with timer.stage("normalize"):
+        utils.normalize_events(events, source="newwest")
+    return events, ["newwest"]
+
+
+def bench_engine(mode, base_url, timer):
+    import engine
+    import event_cache
+
+    # Fresh cache so every detail page is fetched; no browser: the list page comes from the fixture
+    event_cache.CACHE_DIR = tempfile.mkdtemp()
+    newwest = engine.NewWestSource(shard_size=None)
+    with open(os.path.join(FIXTURE_DIR, "newwest", "list.html"), encoding="utf-8") as f:
+        list_html = f.read()
+    newwest.scraper.load_session_list = lambda driver, start=None, end=None: list_html
+    engine.driver_pool.lease = no_browser
+
+    local_limit = (16, 1000.0, 16)
+    host_limits = {urlparse(host).netloc: local_limit for host in HOSTS}
+    runner = engine.Engine([engine.BurnabySource(), newwest], host_limits=host_limits)
+    route_to_stand_in(runner.session, base_url, runner.io_workers)
+    try:
+        with timer.stage("engine"):
+            results = asyncio.run(runner.run())
+    finally:
+        runner.close()
+    return results["burnaby"] + results["newwest"], ["burnaby", "newwest"]
+
+
+def bench_newwest_browser(mode, base_url, timer):
+    import driver_pool
+    scraper = load_scraper("newwest")
+    events = []
+    with driver_pool.lease() as driver:
+        for event in html_fixtures.load_sessions("newwest"):
+            path = os.path.join(DETAILS_DIR, html_fixtures.detail_fixture_name(event["eventLink"]))
+            with timer.stage("get_details_and_return"):
+                ages, fee, eventDate, eventTime = scraper.get_details_and_return(driver, Path(path).as_uri())
+            events.append(dict(event, ages=ages, fee=fee, eventDate=eventDate, eventTime=eventTime))
+    return events, ["newwest"]
+
+
+SCENARIOS = {
+    "burnaby-api": bench_burnaby_api,
+    "burnaby-cards": bench_burnaby_cards,
+    "newwest": bench_newwest,
+    "engine": bench_engine,
+    "newwest-browser": bench_newwest_browser,
+}
+
+
+def run_scenario(name, mode, base_url, repeat):
+    """Runs in a fresh worker process so peak RSS belongs to this scenario alone"""
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))  # utils.DATA_DIR is relative to the scrapers dir
+    timer = StageTimer()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        events, cities = SCENARIOS[name](mode, base_url, timer)
+        timings.append(time.perf_counter() - start)
+
+    seconds = statistics.median(timings)
+    return {
+        "events": len(events),
+        "seconds": round(seconds, 6),
+        "events_per_sec": round(len(events) / seconds, 1) if seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": timer.summary(),
+        "matches_expected": matches(events, cities),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Names of scenarios that regressed against a previous results file"""
+    regressions = []
+    for name, result in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not result["matches_expected"]:
+            regressions.append(f"{name}: output no longer matches assets/data")
+        if before and before.get("events_per_sec") and result["events_per_sec"] is not None:
+            if result["events_per_sec"] < before["events_per_sec"] * (1 - tolerance):
+                regressions.append(f"{name}: {result['events_per_sec']} events/s, was {before['events_per_sec']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scrape benchmark against synthetic fixtures.")
+    parser.add_argument("--mode", choices=("http", "file"), default="http")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS))
+    parser.add_argument("--browser", action="store_true", help="also time get_details_and_return in Chrome")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed events/sec drop vs the baseline")
+    args = parser.parse_args()
+
+    names = args.scenarios or [name for name in SCENARIOS if name != "newwest-browser" or args.browser]
+    if args.mode == "file" and "engine" in names:
+        names.remove("engine")  # the engine always talks HTTP
+
+    results = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "mode": args.mode,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "scenarios": {},
+    }
+
+    with fixture_server() as base_url:
+        for name in names:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                result = pool.submit(run_scenario, name, args.mode, base_url, args.repeat).result()
+            results["scenarios"][name] = result
+            stages = ", ".join(f"{stage} {info['total_ms'] / args.repeat:.1f}ms" for stage, info in result["stages"].items())
+            print(f"{name:<16} {result['events']:>4} events  {result['events_per_sec']:>9} ev/s  "
+                  f"{result['peak_rss_mb']:>6} MB  {'ok' if result['matches_expected'] else 'MISMATCH'}  ({stages})")
+
+    with utils.atomic_open(args.output) as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# binary_file.py
+"""
+Container format shared by the memory-mappable outputs (columnar.py's .spkc and
+query_index.py's .spki). All integers are little-endian:
+
+    magic (4 bytes) | u32 version | u32 header length | header JSON | padding to 8 bytes | blocks
+
+Each block starts on an 8-byte boundary; its "offset" in the header is relative to the start
+of the data section. `BinaryFile` copies whatever it reads out of the map, so nothing it returns
+refers to the mapping: results stay valid after close() and close() never fails on exported buffers.
+"""
+import array
+import json
+import mmap
+import struct
+import sys
+
+import utils
+
+TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+
+def width(max_value):
+    """Bytes per integer needed to store values up to `max_value`"""
+    if max_value <= 0xFF:
+        return 1
+    if max_value <= 0xFFFF:
+        return 2
+    return 4
+
+
+def pack_ints(values, size):
+    """Unsigned little-endian integers of `size` bytes each"""
+    block = array.array(TYPECODES[size], values)
+    if sys.byteorder != "little":
+        block.byteswap()
+    return block.tobytes()
+
+
+def write(path, magic, version, header, blocks):
+    """
+    Write a container file. `blocks` is a list of (meta, bytes) where each meta is a dict
+    referenced from `header`; its "offset" is filled in before the header is serialized.
+    """
+    position = 0
+    paddings = []
+    for meta, block in blocks:
+        paddings.append(-position % 8)
+        position += paddings[-1]
+        meta["offset"] = position
+        position += len(block)
+
+    header_bytes = json.dumps(header, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    preamble = magic + struct.pack("<II", version, len(header_bytes)) + header_bytes
+    preamble += b"\0" * (-len(preamble) % 8)
+
+    with utils.atomic_open(path, "wb") as f:
+        f.write(preamble)
+        for padding, (_, block) in zip(paddings, blocks):
+            f.write(b"\0" * padding)
+            f.write(block)
+    return path
+
+
+class BinaryFile:
+    """Memory-mapped container reader; `kind` names the file type in error messages"""
+
+    def __init__(self, path, magic, version, kind):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != magic:
+            self.close()
+            raise ValueError(f"{path} is not a {kind} file")
+        found, header_length = struct.unpack_from("<II", self._map, 4)
+        if found != version:
+            self.close()
+            raise ValueError(f"Unsupported {kind} file version {found}")
+        self.header = json.loads(self._map[12:12 + header_length].decode("utf-8"))
+        self._data_start = 12 + header_length + (-(12 + header_length) % 8)
+
+    def read(self, offset, length):
+        """`length` bytes of the data section starting at `offset`"""
+        start = self._data_start + offset
+        return self._map[start:start + length]
+
+    def ints(self, offset, count, size):
+        """`count` unsigned integers of `size` bytes each, as an array"""
+        values = array.array(TYPECODES[size])
+        values.frombytes(self.read(offset, count * size))
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def close(self):
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,200 @@
+# burnaby_drop_in_scraper.py
+"""
+Burnaby (ActiveCommunities) drop-in volleyball scraper.
+
+Importing this module is cheap: requests, Selenium and BeautifulSoup are only loaded on the
+code paths that use them, so the parsing helpers can be reused and timed on their own.
+
+Usage: python burnaby_drop_in_scraper.py [--engine api|selenium] [--fixtures DIR]
+       python burnaby_drop_in_scraper.py --parse-only saved-list.html
+"""
+import argparse
+import json
+import sys
+import utils
+from event_record import Event, to_json
+import activecommunities
+import event_cache
+import driver_pool
+import readiness
+import metrics
+import ndjson_sink
+import sqlite_sink
+import parsing
+
+# URL to scrape for volleyball drop-in events
+volleyball_url = 'https://anc.ca.apm.activecommunities.com/burnaby/activity/search?onlineSiteId=0&activity_select_param=2&activity_keyword=volleyball&viewMode=list'
+
+# One of these links per activity card
+CARD_SELECTOR = 'a[aria-label^="Reserve In Advance:"]'
+
+def build_event(card):
+    """
+    Turn the raw fields of one activity card (see parsing.parse_burnaby_cards) into an Event record.
+    Date, day of week, venue type, level and status are filled in by utils.normalize_events.
+    """
+    # get the event title
+    title = card['label'].replace('Reserve In Advance: ', '').strip()
+
+    # Get the link to the event page
+    eventLink = card['href']
+
+    location = card['location'] if card['location'] is not None else 'No location'
+
+    eventID = card['number'].replace("#", "")
+
+    ages = card['ages'] if card['ages'] is not None else 'No age group'
+    if "Age at least 13 yrs but less than 19 yrs" in ages:
+        ages = "13yrs - 19yrs"
+    else:
+        ages = ages[:-1]
+        ages = ages.replace("yrs", "").replace(" ", "")  # Remove "yrs" and any remaining spaces
+
+    openings_text = (card['openings'] or 'Full').strip()  # Get the text and remove extra spaces
+    openings = openings_text.split()[-1]  # Get the last part, which should be the number of openings
+
+    # Standardized to ISO (YYYY-MM-DD) by utils.normalize_events
+    raw_date = card['date'].strip() if card['date'] is not None else 'No date'
+
+    # Remove the day prefix (e.g., "Sat ") and keep only the time range
+    raw_time = card['time'].strip() if card['time'] is not None else 'No time range'
+    eventTime = ' '.join(raw_time.split()[1:]).upper() if raw_time != 'No time range' else raw_time.upper()
+
+    if not eventLink:
+        return None
+
+    return Event(
+        title=title,
+        eventID=eventID,
+        location=location,
+        city='Burnaby',
+        eventLink=eventLink,
+        venueType=None,
+        category='Drop-in',
+        level=None,
+        ages=ages,
+        openings=openings,
+        status=None,
+        eventDate=raw_date,
+        eventTime=eventTime,
+        dayOfWeek=None,
+        fee="Pay in person"
+    )
+
+def load_card_page(driver):
+    """Open the list page and scroll until no more cards load; returns the rendered page source"""
+    # Open the URL
+    with metrics.timer("page_load"):
+        driver.get(volleyball_url)
+
+        # Wait for the first batch of cards instead of a fixed delay
+        count = readiness.wait_for_stable_count(driver, CARD_SELECTOR, "initial cards", timeout=15, minimum=1)
+        readiness.track_requests(driver)
+
+    # Keep scrolling until no more cards load
+    with metrics.timer("scroll"):
+        while True:
+            # Scroll to bottom
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+            # Returns as soon as new cards show up, or once the network is idle without any
+            new_count = readiness.wait_for_more(driver, CARD_SELECTOR, count, "scroll")
+
+            # Break if no more content loaded
+            if new_count == count:
+                break
+
+            count = new_count
+
+    return driver.page_source
+
+def scrape_with_selenium(sink=None):
+    """Fallback engine: scroll the list page in headless Chrome and parse the cards"""
+    with driver_pool.lease() as driver:
+        readiness.recorder.reset()
+        page_source = load_card_page(driver)
+
+    # Parse the page once and pull every card's fields in one pass
+    with metrics.timer("parse"):
+        cards = parsing.parse_burnaby_cards(page_source)
+        events = [event for event in map(build_event, cards) if event]
+    with metrics.timer("normalize"):
+        utils.normalize_events(events, source="burnaby")
+    if sink:
+        sink.write_many(events)
+
+    print(readiness.recorder.summary())
+    return events
+
+def parse_saved_page(path):
+    """Run the parsing path on a saved activity list page: no browser, no network, nothing saved"""
+    with open(path, encoding="utf-8") as f:
+        page_source = f.read()
+    with metrics.timer("parse"):
+        events = [event for event in map(build_event, parsing.parse_burnaby_cards(page_source)) if event]
+    utils.normalize_events(events, source="burnaby")
+    return events
+
+def scrape_volleyball_events(engine="api", fixture_dir=None):
+    try:
+        # Events are streamed to burnaby-drop-in-sessions.ndjson as they're parsed; the file is
+        # only moved into place once the run has been saved
+        with metrics.run("burnaby"), ndjson_sink.NDJSONSink(ndjson_sink.ndjson_path("burnaby")) as sink:
+            events = None
+
+            # Prefer the activity search endpoint; only start Chrome if it can't be used
+            if engine == "api":
+                try:
+                    with metrics.timer("api_fetch"):
+                        events = activecommunities.fetch_volleyball_events(fixture_dir=fixture_dir, sink=sink)
+                except Exception as e:
+                    print(f"Activity search endpoint failed, falling back to Selenium: {e}")
+                    metrics.log("api_failed", level="warning", job="burnaby", error=repr(e))
+                    metrics.count("engine_fallbacks")
+                    sink.restart()  # drop the pages that did arrive before the failure
+
+            if not events:
+                events = scrape_with_selenium(sink)
+
+            # An empty result means the page changed or didn't load; keep the last good file
+            if not events:
+                raise RuntimeError("No matching volleyball events found")
+            metrics.count("events_scraped", len(events))
+
+            # Debugging: Print the found events with locations, event numbers, categories, ages, and openings
+            print("Found events with Details:")
+            for event in events[:10]:
+                print(f"event Link: {event['eventLink']}, Location: {event['location']}, "
+                f"event ID: {event['eventID']}, Venue Type: {event['venueType']}, "
+                f"Ages: {event['ages']}, Openings: {event['openings']}, "
+                f"Date: {event['eventDate']}, Time: {event['eventTime']}, "
+                f"Day of Week: {event['dayOfWeek']}")
+
+            with metrics.timer("save"):
+                event_cache.record_run(events, "burnaby")
+                utils.save_to_json(events, "burnaby")
+            sqlite_sink.try_save_to_sqlite(events, "burnaby")
+            return events
+
+    except Exception as e:
+        # metrics.run has already logged the traceback and exported the failed run
+        print(f"Error scraping events: {e}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape Burnaby volleyball drop-in sessions.")
+    parser.add_argument("--engine", choices=["api", "selenium"], default="api", help="fetch engine (api falls back to selenium)")
+    parser.add_argument("--fixtures", metavar="DIR", help="replay saved activity search pages (e.g. the synthetic fixtures/burnaby) instead of calling the endpoint")
+    parser.add_argument("--parse-only", metavar="HTML",
+                        help="parse a saved activity list page and print its events as JSON (no browser, no network)")
+    args = parser.parse_args(argv)
+
+    if args.parse_only:
+        events = parse_saved_page(args.parse_only)
+        json.dump(events, sys.stdout, indent=4, default=to_json)
+        print()
+        return events
+    return scrape_volleyball_events(args.engine, args.fixtures)
+
+# Run the scraper
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# columnar.py
+"""
+Compact output formats written alongside the per-city / combined JSON files.
+
+Most event fields repeat heavily (two cities, a handful of venues, levels and fees), so
+these formats store each field as a column and dictionary-encode the repetitive ones:
+
+    *.columns.json  minified JSON: {"count", "dictionaries": {field: [values]}, "columns": {field: [codes or values]}}
+    *.ndjson        minified newline-delimited JSON, one event per line
+    *.spkc          binary columnar file that readers can memory-map, loading only the columns they need
+
+.spkc is a binary_file.py container with magic b"SPKC". The header maps each field to
+{"encoding", "offset", "length", ...}. A "dict" column is an array of uint8/uint16/uint32 codes
+into its "dictionary"; a "string" column is (count + 1) uint32 byte offsets followed by the
+UTF-8 data, with the rows that are None listed under "nulls" (stored as empty strings).
+
+Usage: python columnar.py [path/to/volleyball_sessions.json]   (writes the three files next to it)
+"""
+import json
+import os
+import sys
+
+import binary_file
+import utils
+from event_record import FIELDS
+from ndjson_sink import NDJSONSink
+
+MAGIC = b"SPKC"
+VERSION = 1
+
+# Always dictionary-encoded; other fields are too when fewer than half their values are distinct
+DICTIONARY_COLUMNS = ("city", "location", "venueType", "category", "level", "dayOfWeek", "fee")
+
+
+def _as_dicts(events):
+    return [event.to_dict() if hasattr(event, "to_dict") else event for event in events]
+
+
+def _should_encode(field, values):
+    return field in DICTIONARY_COLUMNS or len(set(values)) * 2 <= len(values)
+
+
+def _dictionary_encode(values):
+    dictionary = []
+    codes = []
+    index = {}
+    for value in values:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(dictionary)
+            dictionary.append(value)
+        codes.append(code)
+    return dictionary, codes
+
+
+def to_columns(events):
+    """{"count", "dictionaries", "columns"} for a list of events (dicts or Event records)"""
+    events = _as_dicts(events)
+    dictionaries = {}
+    columns = {}
+    for field in FIELDS:
+        values = [event.get(field) for event in events]
+        if _should_encode(field, values):
+            dictionaries[field], columns[field] = _dictionary_encode(values)
+        else:
+            columns[field] = values
+    return {"count": len(events), "dictionaries": dictionaries, "columns": columns}
+
+
+def from_columns(data, fields=None):
+    """Rebuild event dicts from `to_columns` output (optionally only some fields)"""
+    fields = fields or FIELDS
+    decoded = {}
+    for field in fields:
+        column = data["columns"][field]
+        dictionary = data["dictionaries"].get(field)
+        decoded[field] = [dictionary[code] for code in column] if dictionary is not None else column
+    return [{field: decoded[field][i] for field in fields} for i in range(data["count"])]
+
+
+def write_columns_json(events, path):
+    data = json.dumps(to_columns(events), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    with utils.atomic_open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def write_ndjson(events, path):
+    with NDJSONSink(path) as sink:
+        sink.write_many(events)
+    return path
+
+
+def write_binary(events, path):
+    """Write events as a memory-mappable .spkc columnar file"""
+    data = to_columns(events)
+    count = data["count"]
+    blocks = []
+    header = {"count": count, "columns": {}}
+
+    for field in FIELDS:
+        column = data["columns"][field]
+        if field in data["dictionaries"]:
+            dictionary = data["dictionaries"][field]
+            size = binary_file.width(max(len(dictionary) - 1, 0))
+            block = binary_file.pack_ints(column, size)
+            meta = {"encoding": "dict", "dictionary": dictionary, "width": size}
+        else:
+            encoded = [(value if value is not None else "").encode("utf-8") for value in column]
+            offsets = [0]
+            for value in encoded:
+                offsets.append(offsets[-1] + len(value))
+            block = binary_file.pack_ints(offsets, 4) + b"".join(encoded)
+            meta = {"encoding": "string"}
+            nulls = [i for i, value in enumerate(column) if value is None]
+            if nulls:
+                meta["nulls"] = nulls
+        meta["length"] = len(block)
+        header["columns"][field] = meta
+        blocks.append((meta, block))
+
+    return binary_file.write(path, MAGIC, VERSION, header, blocks)
+
+
+class ColumnarFile(binary_file.BinaryFile):
+    """
+    Memory-mapped reader for .spkc files. Only the columns you ask for are read and decoded,
+    and what is returned is copied out of the map, so it stays usable after close():
+
+        with ColumnarFile(path) as sessions:
+            dates = sessions.column("eventDate")
+            rows = sessions.rows(["title", "city", "eventDate"])
+    """
+
+    def __init__(self, path):
+        super().__init__(path, MAGIC, VERSION, "columnar session")
+        self.count = self.header["count"]
+
+    def codes(self, field):
+        """Raw dictionary codes of a dictionary-encoded column (an array), plus the dictionary"""
+        meta = self.header["columns"][field]
+        if meta["encoding"] != "dict":
+            raise ValueError(f"Column {field} is not dictionary-encoded")
+        return self.ints(meta["offset"], self.count, meta["width"]), meta["dictionary"]
+
+    def column(self, field):
+        meta = self.header["columns"][field]
+        if meta["encoding"] == "dict":
+            codes, dictionary = self.codes(field)
+            return [dictionary[code] for code in codes]
+
+        offsets = self.ints(meta["offset"], self.count + 1, 4)
+        strings = self.read(meta["offset"] + (self.count + 1) * 4, offsets[-1])
+        values = [strings[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.count)]
+        for i in meta.get("nulls", ()):
+            values[i] = None
+        return values
+
+    def columns(self, fields):
+        return {field: self.column(field) for field in fields}
+
+    def rows(self, fields=None):
+        fields = fields or list(self.header["columns"])
+        columns = self.columns(fields)
+        return [{field: columns[field][i] for field in fields} for i in range(self.count)]
+
+
+def write_compact(events, json_path):
+    """Write the .columns.json, .ndjson and .spkc versions of `json_path` next to it"""
+    base, _ = os.path.splitext(json_path)
+    return [
+        write_columns_json(events, base + ".columns.json"),
+        write_ndjson(events, base + ".ndjson"),
+        write_binary(events, base + ".spkc"),
+    ]
+
+
+def main():
+    json_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "assets", "data", "volleyball_sessions.json")
+    with open(json_path) as f:
+        events = json.load(f)
+
+    print(f"{json_path}: {os.path.getsize(json_path) / 1024:.1f} KB")
+    for path in write_compact(events, json_path):
+        print(f"{path}: {os.path.getsize(path) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
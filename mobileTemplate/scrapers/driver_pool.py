@@ -0,0 +1,248 @@
+# driver_pool.py
+"""
+Shared pool of warm headless Chrome instances for the Selenium scrapers.
+
+Drivers are started lazily (Selenium isn't even imported until the first one starts), leased
+to one scraper at a time, health-checked before each lease and recycled after `max_uses`
+leases or when Chrome's memory has grown too much. The resolved ChromeDriver binary path is
+cached on disk so `ChromeDriverManager().install()` only runs once instead of on every scrape.
+
+    with driver_pool.lease() as driver:
+        driver.get(url)
+"""
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # memory-based recycling is skipped without psutil
+    psutil = None
+
+import metrics
+
+DEFAULT_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", "1"))
+DEFAULT_MAX_USES = int(os.environ.get("DRIVER_MAX_USES", "25"))
+DEFAULT_MAX_RSS_GROWTH_MB = int(os.environ.get("DRIVER_MAX_RSS_GROWTH_MB", "400"))
+
+# Where the resolved chromedriver path is remembered between runs
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "spikeconnect", "chromedriver-path")
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def chrome_options():
+    # Setup Chrome options to run in headless mode
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new")  # modern headless
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    return options
+
+
+def resolve_driver_path():
+    """
+    Return the chromedriver binary path: $CHROMEDRIVER_PATH, then the on-disk cache,
+    then a (slow) ChromeDriverManager download/version check whose result is cached.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+
+        path = os.environ.get("CHROMEDRIVER_PATH")
+        if not path:
+            try:
+                with open(DRIVER_PATH_CACHE) as f:
+                    path = f.read().strip()
+            except OSError:
+                path = None
+
+        if not path or not os.path.exists(path):
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            try:
+                os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+                with open(DRIVER_PATH_CACHE, "w") as f:
+                    f.write(path)
+            except OSError as e:
+                print(f"Could not cache chromedriver path: {e}")
+
+        _driver_path = path
+        return path
+
+
+class PooledDriver:
+    """A Chrome instance plus the bookkeeping the pool needs to decide when to recycle it"""
+
+    def __init__(self, options=None):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        with metrics.timer("driver_startup"):
+            self.driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=options or chrome_options())
+        self.uses = 0
+        self.baseline_rss = self.rss()
+
+    def rss(self):
+        """Resident memory of chromedriver and every Chrome process under it, in bytes"""
+        if psutil is None:
+            return 0
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            return sum(p.memory_info().rss for p in [root] + root.children(recursive=True))
+        except (psutil.Error, AttributeError):
+            return 0
+
+    def is_healthy(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def reset(self):
+        """Close extra tabs and blank the page so the next lease starts clean"""
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+        self.driver.get("about:blank")
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Error quitting driver: {e}")
+
+
+class DriverPool:
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_uses=DEFAULT_MAX_USES,
+                 max_rss_growth_mb=DEFAULT_MAX_RSS_GROWTH_MB, options=None):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_rss_growth = max_rss_growth_mb * 1024 * 1024
+        self.options = options
+        self._idle = []  # most recently used last, so warm drivers are reused
+        self._started = 0
+        # Signalled whenever a driver comes back or a slot frees up for a new one
+        self._available = threading.Condition()
+        self._closed = False
+
+    def _acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("driver pool has been shut down")
+                if self._idle:
+                    return self._idle.pop()
+                if self._started < self.size:
+                    self._started += 1
+                    break
+                # Every driver is leased out; wait for one to come back or to be discarded
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"no driver became free within {timeout}s")
+                self._available.wait(remaining)
+
+        try:
+            return PooledDriver(self.options)
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _release_slot(self):
+        with self._available:
+            self._started -= 1
+            self._available.notify()
+
+    def _return(self, pooled):
+        with self._available:
+            self._idle.append(pooled)
+            self._available.notify()
+
+    def _discard(self, pooled):
+        metrics.count("drivers_discarded")
+        pooled.quit()
+        self._release_slot()
+
+    def _should_recycle(self, pooled):
+        if pooled.uses >= self.max_uses:
+            return True
+        return self.max_rss_growth > 0 and pooled.rss() - pooled.baseline_rss > self.max_rss_growth
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Borrow a healthy driver; it is returned to the pool (or recycled) afterwards"""
+        if self._closed:
+            raise RuntimeError("driver pool has been shut down")
+
+        # Every idle driver may have died; past those, the next one is freshly started
+        for _ in range(self.size + 1):
+            pooled = self._acquire(timeout)
+            if pooled.is_healthy():
+                break
+            self._discard(pooled)
+        else:
+            raise RuntimeError("could not get a healthy driver")
+
+        pooled.uses += 1
+        broken = False
+        try:
+            yield pooled.driver
+        except Exception:
+            broken = not pooled.is_healthy()
+            raise
+        finally:
+            if broken or self._closed or self._should_recycle(pooled):
+                self._discard(pooled)
+            else:
+                try:
+                    pooled.reset()
+                    self._return(pooled)
+                except Exception:
+                    self._discard(pooled)
+
+    def shutdown(self):
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The process-wide pool used by the scrapers (created on first use)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = DriverPool()
+        return _pool
+
+
+def lease(timeout=None):
+    return get_pool().lease(timeout)
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+atexit.register(shutdown)
@@ -0,0 +1,571 @@
+# engine.py
+"""
+Asyncio scraping engine. Fetch, parse and normalize run as separate stages connected by
+bounded queues, so many sources can be polled at once from a single process:
+
+    request frontier -> fetch workers -> [parse queue] -> parse workers -> [normalize queue] -> normalize
+                              ^                                |
+                              +------ follow-up requests ------+
+
+- every host gets its own concurrency limit and token-bucket rate limit (HOST_LIMITS)
+- HTTP goes through one pooled keep-alive session (http_pool.py); browser-only pages are
+  rendered on the shared Chrome pool (driver_pool.py), at most one job per pooled driver
+- failed fetches are retried with exponential backoff and jitter, honouring Retry-After
+- normalized events are appended to <city>-drop-in-sessions.ndjson[.gz] as they arrive
+  (ndjson_sink.py); they are also collected in memory, since finishing a run (cache diff,
+  JSON, SQLite, merge) needs the whole list
+- a source that gives up on a request, or fails to parse or normalize a response, is
+  incomplete: its previously saved sessions are kept and the run is reported as failed
+
+Each city plugs in as a `Source` adapter that creates the first requests and turns responses
+into Event records and follow-up requests. Adding a municipality means adding an adapter to SOURCES.
+
+The engine is a standalone runner and what benchmark.py's `engine` scenario measures. The
+deployed scheduler (scheduler.py, the container's entrypoint) still runs the per-city scrapers
+through orchestrator.py, so its throughput numbers don't apply there yet.
+
+Usage: python engine.py [--sources burnaby newwest] [--fixtures] [--no-save] [--gzip]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import unquote, urlparse
+
+import requests
+
+import activecommunities
+import driver_pool
+import event_cache
+import merge
+import metrics
+import ndjson_sink
+import orchestrator
+import parsing
+import perfectmind
+import sqlite_sink
+import utils
+from event_record import Event
+from http_pool import make_session
+
+# Host -> (concurrent requests, requests per second, burst)
+HOST_LIMITS = {
+    "anc.ca.apm.activecommunities.com": (4, 4.0, 4),
+    "cityofnewwestminster.perfectmind.com": (4, 2.0, 4),
+}
+DEFAULT_HOST_LIMIT = (2, 1.0, 2)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryableStatus(Exception):
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+@dataclass
+class Request:
+    url: str
+    method: str = "GET"
+    json: Optional[dict] = None
+    headers: Optional[dict] = None
+    # Browser job: render(driver, url) -> body, run on a pooled Chrome instead of over HTTP
+    render: Optional[Callable] = None
+    meta: dict = field(default_factory=dict)
+
+
+@dataclass
+class Response:
+    request: Request
+    body: object
+    status: int = 200
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Host:
+    def __init__(self, concurrency, rate, burst):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(rate, burst)
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self.semaphore:
+            await self.bucket.acquire()
+            yield
+
+
+class Source:
+    """
+    Adapter for one city's booking system. `name` is the city key used for the saved files.
+    `parse` and `failed` return Event records and/or follow-up Requests. `failed` raises to
+    give up on a request, which leaves the source incomplete.
+    """
+    name = None
+
+    def start_requests(self):
+        return []
+
+    def parse(self, response):
+        return []
+
+    def failed(self, request, error):
+        raise error
+
+    def normalize(self, events):
+        return utils.normalize_events(events, source=self.name)
+
+    def finish(self, events):
+        """Persist a finished run the same way the standalone scrapers do"""
+        event_cache.record_run(events, self.name)
+        utils.save_to_json(events, self.name)
+        sqlite_sink.try_save_to_sqlite(events, self.name)
+
+
+class BurnabySource(Source):
+    """
+    ActiveCommunities JSON search API (see activecommunities.py). Like the standalone scraper,
+    it falls back to scrolling the list page on a pooled browser when the endpoint fails or
+    can't be read; sessions the API pages already delivered are kept and not repeated.
+    """
+    name = "burnaby"
+
+    def __init__(self, fixture_dir=None, keyword="volleyball"):
+        self.scraper = orchestrator.load_scraper(self.name)
+        self.fixture_dir = fixture_dir
+        self.keyword = keyword
+        self.seen = set()
+        self.fell_back = False
+
+    def page_request(self, page_number):
+        meta = {"page": page_number}
+        if self.fixture_dir:
+            path = activecommunities.fixture_path(self.fixture_dir, page_number)
+            return Request(Path(path).resolve().as_uri(), meta=meta)
+        return Request(
+            activecommunities.LIST_URL,
+            method="POST",
+            json=activecommunities.build_search_body(self.keyword),
+            headers=activecommunities.page_headers(page_number),
+            meta=meta,
+        )
+
+    def browser_request(self):
+        render = lambda driver, url: self.scraper.load_card_page(driver)
+        return Request(self.scraper.volleyball_url, render=render, meta={"kind": "browser"})
+
+    def start_requests(self):
+        self.seen = set()
+        self.fell_back = False
+        return [self.page_request(1)]
+
+    def fall_back(self, reason):
+        """One browser request standing in for every API page; later API failures are covered by it"""
+        if self.fell_back:
+            return []
+        self.fell_back = True
+        print(f"{self.name}: activity search endpoint failed, falling back to Selenium: {reason}")
+        metrics.count("engine_fallbacks", source=self.name)
+        return [self.browser_request()]
+
+    def unseen(self, events):
+        """API pages and the browser fallback can list the same session; the first one keeps it"""
+        fresh = [event for event in events if event_cache.event_key(event) not in self.seen]
+        self.seen.update(event_cache.event_key(event) for event in fresh)
+        return fresh
+
+    def parse(self, response):
+        if response.request.meta.get("kind") == "browser":
+            cards = parsing.parse_burnaby_cards(response.body)
+            return self.unseen([event for event in map(self.scraper.build_event, cards) if event])
+
+        page_number = response.request.meta["page"]
+        try:
+            page = json.loads(response.body)
+            events = activecommunities.parse_page(page)
+            pages = activecommunities.total_pages(page) if page_number == 1 else 0
+        except (ValueError, TypeError, AttributeError) as e:
+            return self.fall_back(f"page {page_number} could not be read ({e})")
+        if page_number == 1 and not events:
+            return self.fall_back("no activities on the first page")
+
+        items = self.unseen(events)
+        items += [self.page_request(n) for n in range(2, pages + 1)]
+        return items
+
+    def failed(self, request, error):
+        if request.meta.get("kind") == "browser":
+            raise error
+        return self.fall_back(error)
+
+
+class NewWestSource(Source):
+    """
+    PerfectMind class list, one browser-rendered request per date-range shard. Detail pages are
+    fetched over HTTP (falling back to the browser) unless the event cache already has them.
+    """
+    name = "newwest"
+
+    def __init__(self, start=None, end=None, shard_size="default"):
+        self.scraper = orchestrator.load_scraper(self.name)
+        self.start, self.end = start, end
+        self.shard_size = self.scraper.SHARD_SIZE if shard_size == "default" else shard_size
+        self.cache = None
+        self.seen = set()
+        self.shard_count = self.shards_failed = 0
+
+    def start_requests(self):
+        self.cache = event_cache.EventCache(self.name)
+        self.seen = set()
+        shards = self.scraper.date_shards(*self.scraper.date_range(self.start, self.end), self.shard_size)
+        self.shard_count, self.shards_failed = len(shards), 0
+        return [self.list_request(shard) for shard in shards]
+
+    def list_request(self, shard):
+        render = lambda driver, url: self.scraper.render_shard(driver, *shard)
+        return Request(self.scraper.volleyball_url, render=render, meta={"kind": "list", "shard": shard})
+
+    def detail_fallback(self, event):
+        render = lambda driver, url: self.scraper.get_details_and_return(driver, url)
+        return Request(event["eventLink"], render=render, meta={"kind": "browser-detail", "event": event})
+
+    def fill(self, event, details):
+        ages, fee, eventDate, eventTime = details
+        event.update({'ages': ages, 'eventDate': eventDate, 'eventTime': eventTime, 'fee': fee})
+        return event
+
+    def parse(self, response):
+        kind = response.request.meta["kind"]
+        if kind == "list":
+            items = []
+            for event in map(self.scraper.build_event, parsing.parse_newwest_sessions(response.body)):
+                # Shards are merged by event_key; the first one to list a session keeps it
+                if not event or event_cache.event_key(event) in self.seen:
+                    continue
+                self.seen.add(event_cache.event_key(event))
+                cached = self.cache.get(event_cache.event_key(event))
+                if cached:
+                    items.append(self.fill(event, (cached['ages'], cached['fee'], cached['eventDate'], cached['eventTime'])))
+                else:
+                    items.append(Request(event["eventLink"], meta={"kind": "detail", "event": event}))
+            return items
+
+        event = response.request.meta["event"]
+        if kind == "detail":
+            try:
+                return [self.fill(event, perfectmind.parse_details_page(response.body))]
+            except ValueError:
+                return [self.detail_fallback(event)]  # the page needs JavaScript to render
+        return [self.fill(event, response.body)]
+
+    def failed(self, request, error):
+        kind = request.meta.get("kind")
+        if kind == "detail":
+            return [self.detail_fallback(request.meta["event"])]
+        if kind == "list":
+            # Keep the last run's sessions for a shard that failed after its retries
+            shard_start, shard_end = request.meta["shard"]
+            print(f"{self.name}: sessions from {shard_start} to {shard_end} failed, keeping the last run's ({error})")
+            metrics.count("shards_failed")
+            self.shards_failed += 1
+            if self.shards_failed == self.shard_count:
+                raise RuntimeError("Every date range failed to load")
+            carried = [event for event in self.scraper.previous_events(shard_start, shard_end)
+                       if event_cache.event_key(event) not in self.seen]
+            self.seen.update(event_cache.event_key(event) for event in carried)
+            return carried
+        return super().failed(request, error)
+
+    def finish(self, events):
+        event_cache.record_run(events, self.name, self.cache)
+        utils.save_to_json(events, self.name)
+        sqlite_sink.try_save_to_sqlite(events, self.name)
+
+
+# City key -> adapter factory (called with the engine options)
+SOURCES = {
+    "burnaby": lambda fixtures: BurnabySource(activecommunities.FIXTURE_DIR if fixtures else None),
+    "newwest": lambda fixtures: NewWestSource(),
+}
+
+
+class Engine:
+    def __init__(self, sources, io_workers=16, parse_workers=2, queue_size=32,
+                 retries=3, backoff=0.5, host_limits=None, browser_slots=None, sinks=None):
+        self.sources = sources
+        self.sinks = sinks or {}  # city -> NDJSONSink
+        self.io_workers = io_workers
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+        self.retries = retries
+        self.backoff = backoff
+        self.host_limits = host_limits or HOST_LIMITS
+        self.browser_slots = browser_slots or driver_pool.DEFAULT_POOL_SIZE
+
+        # Retries happen here, through the rate limiter, not inside urllib3
+        self.session = make_session(pool_size=io_workers, retries=0)
+        self.io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="engine-io")
+        self.parse_pool = ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix="engine-parse")
+        self.hosts = {}
+
+    def host(self, url):
+        name = urlparse(url).netloc
+        if name not in self.hosts:
+            self.hosts[name] = Host(*self.host_limits.get(name, DEFAULT_HOST_LIMIT))
+        return self.hosts[name]
+
+    # --- fetch stage ---
+
+    def _http(self, request):
+        response = self.session.request(request.method, request.url, json=request.json,
+                                        headers=request.headers, timeout=15)
+        if response.status_code in RETRY_STATUSES:
+            raise RetryableStatus(response.status_code, response.headers.get("Retry-After"))
+        response.raise_for_status()
+        return Response(request, response.text, response.status_code)
+
+    def _render(self, request):
+        with driver_pool.lease() as driver:
+            return Response(request, request.render(driver, request.url))
+
+    def _read_file(self, request):
+        with open(unquote(urlparse(request.url).path)) as f:
+            return Response(request, f.read())
+
+    async def _fetch_once(self, request):
+        loop = asyncio.get_running_loop()
+        if request.url.startswith("file://"):
+            return await loop.run_in_executor(self.io_pool, self._read_file, request)
+        async with self.host(request.url).slot():
+            if request.render:
+                async with self.browser:
+                    return await loop.run_in_executor(self.io_pool, self._render, request)
+            return await loop.run_in_executor(self.io_pool, self._http, request)
+
+    async def fetch(self, request):
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._fetch_once(request)
+            except (RetryableStatus, requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2 ** attempt * (0.5 + random.random())
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                print(f"Retrying {request.url} in {delay:.1f}s ({e})")
+                metrics.count("retries", host=urlparse(request.url).netloc)
+                await asyncio.sleep(delay)
+
+    async def fetch_worker(self):
+        while True:
+            source, request = await self.frontier.get()
+            try:
+                with metrics.timer("fetch", source=source.name):
+                    response = await self.fetch(request)
+            except Exception as e:
+                metrics.count("fetch_failures", source=source.name)
+                await self.handle(source, source.failed, request, e)
+                self.done_with_one()
+                continue
+            await self.parse_queue.put((source, response))
+
+    # --- parse stage ---
+
+    async def parse_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            source, response = await self.parse_queue.get()
+            try:
+                # Parsing is CPU-bound; keep it off the event loop
+                with metrics.timer("parse", source=source.name):
+                    items = await loop.run_in_executor(self.parse_pool, source.parse, response)
+                await self.dispatch(source, items)
+            except Exception as e:
+                print(f"{source.name}: error parsing {response.request.url}: {e}")
+                metrics.count("parse_failures", source=source.name)
+                self.incomplete.add(source.name)
+            finally:
+                self.done_with_one()
+
+    async def handle(self, source, callback, *args):
+        try:
+            await self.dispatch(source, callback(*args))
+        except Exception as e:
+            print(f"{source.name}: giving up on {args[0].url}: {e}")
+            metrics.count("requests_abandoned", source=source.name)
+            self.incomplete.add(source.name)
+
+    async def dispatch(self, source, items):
+        events = []
+        for item in items:
+            if isinstance(item, Request):
+                self.schedule(source, item)
+            elif isinstance(item, Event):
+                events.append(item)
+        if events:
+            await self.normalize_queue.put((source, events))
+
+    # --- normalize stage ---
+
+    async def normalize_worker(self):
+        while True:
+            source, events = await self.normalize_queue.get()
+            try:
+                with metrics.timer("normalize", source=source.name):
+                    events = source.normalize(events)
+                self.results[source.name].extend(events)
+                sink = self.sinks.get(source.name)
+                if sink:
+                    sink.write_many(events)
+            except Exception as e:
+                print(f"{source.name}: error normalizing {len(events)} events: {e}")
+                metrics.count("normalize_failures", source=source.name)
+                self.incomplete.add(source.name)
+            finally:
+                self.normalize_queue.task_done()
+
+    # --- bookkeeping ---
+
+    def schedule(self, source, request):
+        self.pending += 1
+        self.frontier.put_nowait((source, request))
+
+    def done_with_one(self):
+        self.pending -= 1
+        if self.pending == 0:
+            self.idle.set()
+
+    async def run(self):
+        """
+        Run every source to completion. Returns {city: [events]}; `self.incomplete` then holds
+        the cities that lost requests or responses on the way.
+        """
+        # Follow-up requests are scheduled while parsing, so the frontier itself is unbounded
+        # (a bounded frontier could deadlock fetchers and parsers waiting on each other).
+        # The queues holding response bodies and events are bounded.
+        self.frontier = asyncio.Queue()
+        self.parse_queue = asyncio.Queue(self.queue_size)
+        self.normalize_queue = asyncio.Queue(self.queue_size)
+        self.browser = asyncio.Semaphore(self.browser_slots)
+        self.pending = 0
+        self.idle = asyncio.Event()
+        self.results = {source.name: [] for source in self.sources}
+        self.incomplete = set()
+
+        for source in self.sources:
+            for request in source.start_requests():
+                self.schedule(source, request)
+
+        workers = [asyncio.create_task(self.fetch_worker()) for _ in range(self.io_workers)]
+        workers += [asyncio.create_task(self.parse_worker()) for _ in range(self.parse_workers)]
+        workers.append(asyncio.create_task(self.normalize_worker()))
+
+        try:
+            if self.pending:
+                await self.idle.wait()
+            await self.normalize_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        for name, events in self.results.items():
+            events.sort(key=merge.sort_key)
+        return self.results
+
+    def close(self):
+        self.io_pool.shutdown()
+        self.parse_pool.shutdown()
+        self.session.close()
+
+
+@metrics.run("engine")
+def run_sources(names, fixtures=False, save=True, compress=False, **engine_options):
+    sources = [SOURCES[name](fixtures) for name in names]
+    sinks = {name: ndjson_sink.NDJSONSink(ndjson_sink.ndjson_path(name, compress)) for name in names} if save else {}
+    engine = Engine(sources, sinks=sinks, **engine_options)
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(engine.run())
+    except BaseException:
+        for sink in sinks.values():
+            sink.abort()
+        raise
+    finally:
+        engine.close()
+
+    incomplete = []
+    for source in sources:
+        events = results[source.name]
+        sink = sinks.get(source.name)
+        print(f"{source.name}: {len(events)} events")
+        metrics.count("events_scraped", len(events), source=source.name)
+        if source.name in engine.incomplete:
+            # Saving a partial run would drop the missing sessions from JSON, the delta and SQLite
+            print(f"{source.name}: incomplete run, keeping previously saved sessions")
+            incomplete.append(source.name)
+            results[source.name] = utils.load_from_json(source.name)
+            if sink:
+                sink.abort()
+        elif not events:
+            print(f"{source.name}: nothing scraped, keeping previously saved sessions")
+            metrics.log("no_events", level="warning", job="engine", source=source.name)
+            results[source.name] = utils.load_from_json(source.name)
+            if sink:
+                sink.abort()
+        elif save:
+            with metrics.timer("save", source=source.name):
+                sink.close()
+                source.finish(events)
+    print(f"Total wall-clock time: {time.perf_counter() - start:.1f}s")
+
+    if save:
+        merge.merge_files()
+    if incomplete:
+        raise RuntimeError(f"Incomplete scrape for {', '.join(incomplete)}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape every source with the asyncio engine.")
+    parser.add_argument("--sources", nargs="+", choices=sorted(SOURCES), default=sorted(SOURCES))
+    parser.add_argument("--fixtures", action="store_true", help="replay the saved fixture responses where a source has them")
+    parser.add_argument("--no-save", action="store_true", help="don't write JSON / SQLite output")
+    parser.add_argument("--gzip", action="store_true", help="gzip the streamed NDJSON output")
+    parser.add_argument("--io-workers", type=int, default=16)
+    args = parser.parse_args()
+
+    run_sources(args.sources, args.fixtures, not args.no_save, args.gzip, io_workers=args.io_workers)
+
+
+if __name__ == "__main__":
+    main()
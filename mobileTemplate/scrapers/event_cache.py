@@ -0,0 +1,160 @@
+# event_cache.py
+"""
+Persistent per-event cache and change detection for incremental scraping.
+
+A session's title, location, ages, fee, date and time never change once it is published,
+so they are cached on disk per city, keyed by `event_key`. Later runs only need to refresh
+openings/status for known events and fetch detail pages for new ones.
+Every run also writes a delta (added / changed / removed events) next to the cache.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import date
+
+import utils
+from event_record import to_json
+
+CACHE_DIR = os.path.join(utils.DATA_DIR, "cache")
+
+# Fields that are fixed once an event is published
+IMMUTABLE_FIELDS = ("title", "location", "ages", "fee", "eventDate", "eventTime")
+
+# Entries not seen by a scrape for this long are dropped
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def event_key(event):
+    """
+    Identity of one session. New Westminster reuses a class's eventID for every occurrence,
+    but each occurrence has its own link (it carries the occurrence date), so prefer that.
+    """
+    return event.get("eventLink") or event["eventID"]
+
+
+def content_hash(event, fields=None):
+    """Stable hash of an event (or just `fields` of it) used to detect changes"""
+    if fields is not None:
+        event = {field: event.get(field) for field in fields}
+    payload = json.dumps(event, sort_keys=True, separators=(",", ":"), default=to_json)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class EventCache:
+    """
+    On-disk cache of immutable event fields for one city.
+    Entries are kept in least-recently-used order and evicted by TTL, past event date or size.
+    """
+
+    def __init__(self, city, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, cache_dir=None):
+        self.city = city
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = os.path.join(cache_dir or CACHE_DIR, f"{city}-event-cache.json")
+        self.entries = OrderedDict()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                self.entries = OrderedDict(json.load(f))
+        except (OSError, ValueError):
+            self.entries = OrderedDict()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with utils.atomic_open(self.path) as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+
+    def get(self, key):
+        """Return the cached immutable fields for an event (by `event_key`), or None if it hasn't been seen"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry["fields"]
+
+    def put(self, event):
+        fields = {field: event.get(field) for field in IMMUTABLE_FIELDS}
+        if "Unknown" in fields.values():
+            return  # the detail page failed; try again next run instead of caching the gap
+
+        key = event_key(event)
+        self.entries[key] = {
+            "fields": fields,
+            "hash": content_hash(fields),
+            "last_seen": time.time(),
+        }
+        self.entries.move_to_end(key)
+
+    def evict(self, now=None):
+        """Drop expired and already-finished events, then the least recently used over the size cap"""
+        now = now or time.time()
+        today = date.today().isoformat()
+
+        for key in list(self.entries):
+            entry = self.entries[key]
+            expired = now - entry["last_seen"] > self.ttl
+            finished = (entry["fields"].get("eventDate") or today) < today
+            if expired or finished:
+                del self.entries[key]
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def compute_delta(previous, current):
+    """
+    Compare two runs' event lists by `event_key`.
+    Returns {"added": [...], "changed": [...], "removed": [...]}; changed entries list the fields that differ.
+    """
+    previous_by_key = {event_key(event): event for event in previous}
+    current_by_key = {event_key(event): event for event in current}
+
+    added = [event for key, event in current_by_key.items() if key not in previous_by_key]
+    removed = [event for key, event in previous_by_key.items() if key not in current_by_key]
+
+    changed = []
+    for key, event in current_by_key.items():
+        old = previous_by_key.get(key)
+        if old is not None and content_hash(old) != content_hash(event):
+            fields = sorted(key for key in set(event.keys()) | set(old.keys()) if old.get(key) != event.get(key))
+            changed.append({"eventID": event["eventID"], "fields": fields, "event": event})
+
+    return {"added": added, "changed": changed, "removed": removed}
+
+
+def save_delta(delta, city, cache_dir=None):
+    file_path = os.path.join(cache_dir or CACHE_DIR, f"{city}-drop-in-delta.json")
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with utils.atomic_open(file_path) as f:
+        json.dump(delta, f, indent=4, default=to_json)
+    return file_path
+
+
+def record_run(events, city, cache=None):
+    """
+    Update the cache with this run's events and write the delta against the last saved file.
+    Call before `utils.save_to_json` overwrites that file.
+    """
+    if cache is None:  # not `or`: an empty cache is falsy (it has a __len__)
+        cache = EventCache(city)
+    for event in events:
+        cache.put(event)
+    cache.evict()
+    cache.save()
+
+    delta = compute_delta(utils.load_from_json(city), events)
+    save_delta(delta, city, os.path.dirname(cache.path))
+    print(f"{city}: {len(delta['added'])} added, {len(delta['changed'])} changed, "
+          f"{len(delta['removed'])} removed since last run")
+    return delta
@@ -0,0 +1,87 @@
+# event_record.py
+"""
+Typed, compact record for one scraped session.
+
+Both scrapers build `Event` objects instead of 15-key dicts. With `__slots__` a record
+has no per-instance __dict__, so a large scrape takes a fraction of the memory.
+Records still support dict-style access (`event['title']`, `event.get(...)`,
+`event[...] = ...`) so the rest of the pipeline can treat them like the old dicts,
+and `json.dump(..., default=event_record.to_json)` writes them in the same shape.
+"""
+from dataclasses import dataclass
+
+# Field order of the JSON files the app loads
+FIELDS = (
+    "title",
+    "eventID",
+    "location",
+    "city",
+    "eventLink",
+    "venueType",
+    "category",
+    "level",
+    "ages",
+    "openings",
+    "status",
+    "eventDate",
+    "eventTime",
+    "dayOfWeek",
+    "fee",
+)
+
+
+@dataclass
+class Event:
+    __slots__ = FIELDS
+
+    title: str
+    eventID: str
+    location: str
+    city: str
+    eventLink: str
+    venueType: str
+    category: str
+    level: str
+    ages: str
+    openings: str
+    status: str
+    eventDate: str
+    eventTime: str
+    dayOfWeek: str
+    fee: str
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*(data.get(field) for field in FIELDS))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    # Dict-style access for code that predates the record type
+
+    def __getitem__(self, field):
+        if field not in FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field, value):
+        if field not in FIELDS:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def get(self, field, default=None):
+        return getattr(self, field, default) if field in FIELDS else default
+
+    def keys(self):
+        return FIELDS
+
+    def update(self, values):
+        for field, value in values.items():
+            self[field] = value
+
+
+def to_json(obj):
+    """`default=` hook for json.dump / json.dumps so Event records serialize like the old dicts"""
+    if isinstance(obj, Event):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
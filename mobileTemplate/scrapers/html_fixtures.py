@@ -0,0 +1,148 @@
+# html_fixtures.py
+"""
+Render synthetic HTML fixtures of the Burnaby and New Westminster list pages (and the
+New Westminster class detail pages) from the checked-in assets/data/*-drop-in-sessions.json
+files. The markup is rebuilt from the selectors and XPaths the scrapers use, not saved from
+the live sites, so it only has the elements the parsers look for. Used by the benchmarks
+and offline runs.
+
+Usage: python html_fixtures.py   (rewrites fixtures/<city>/list.html and fixtures/newwest/details/)
+"""
+import html
+import json
+import os
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+
+SCRAPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(SCRAPERS_DIR, "fixtures")
+DATA_DIR = os.path.join(SCRAPERS_DIR, "..", "assets", "data")
+
+NEWWEST_BASE_URL = "https://cityofnewwestminster.perfectmind.com"
+
+
+def load_sessions(city):
+    with open(os.path.join(DATA_DIR, f"{city}-drop-in-sessions.json")) as f:
+        return json.load(f)
+
+
+def _burnaby_ages_text(ages):
+    if ages == "13yrs - 19yrs":
+        return "Age at least 13 yrs but less than 19 yrs"
+    # The live card text ends with a separator that the scraper strips off
+    return ages.replace("+", " yrs + ")
+
+
+def render_burnaby_card(event):
+    e = {key: html.escape(str(value)) for key, value in event.items()}
+    date = datetime.strptime(event["eventDate"], "%Y-%m-%d")
+    return f"""
+<div class="activity-card">
+  <div class="activity-card-info">
+    <div class="activity-card-info__name">
+      <a href="{e['eventLink']}" aria-label="Reserve In Advance: {e['title']}">{e['title']}</a>
+    </div>
+    <div class="activity-card-info__location"><i class="icon-location"></i><span>{e['location']}</span></div>
+    <div class="activity-card-info__props">
+      <span class="activity-card-info__number"><span>#{e['eventID']}</span></span>
+      <span class="activity-card-info__ages">{html.escape(_burnaby_ages_text(event['ages']))}</span>
+      <span class="activity-card-info__openings"><span>Openings {e['openings']}</span></span>
+    </div>
+    <div class="activity-card-info__datetime">
+      <span class="activity-card-info__dateRange">{date.strftime('%B')} {date.day}, {date.year}</span>
+      <span class="activity-card-info__timeRange">{date.strftime('%a')} {e['eventTime']}</span>
+    </div>
+  </div>
+</div>"""
+
+
+def render_newwest_session(event):
+    e = {key: html.escape(str(value)) for key, value in event.items()}
+    relative_url = html.escape(event["eventLink"].replace(NEWWEST_BASE_URL, ""))
+    if event["openings"] == "Unspecified":
+        spots = ""
+    elif event["openings"].isdigit():
+        spots = f"<span>{e['openings']} spots left</span>"
+    else:
+        spots = f"<span>{e['openings']}</span>"
+    return f"""
+<div class="bm-class-container">
+  <div class="bm-class-header-wrapper">
+    <h3> {e['title']} </h3>
+    <span class="bm-event-description" aria-label="Volleyball - Drop-in">Volleyball - Drop-in</span>
+    <span class="bm-event-description" aria-label="event number">#{e['eventID']}</span>
+  </div>
+  <div class="bm-group-item-link">
+    <div class="bm-spots-left-label">{spots}</div>
+    <div class="bm-book-button">
+      <input type="button" class="bm-button" value="Register"
+             onclick="window.location.href='{relative_url}'" />
+    </div>
+  </div>
+  <div class="location-block"><span>{e['location']} - Gymnasium</span></div>
+</div>"""
+
+
+def detail_fixture_name(eventLink):
+    """File name of a class occurrence's detail page: <classId>-<occurrenceDate>.html"""
+    query = parse_qs(urlparse(eventLink).query)
+    return f"{query['classId'][0]}-{query['occurrenceDate'][0]}.html"
+
+
+def render_newwest_detail(event):
+    e = {key: html.escape(str(value)) for key, value in event.items()}
+    date = datetime.strptime(event["eventDate"], "%Y-%m-%d")
+    return render_page(event["title"], f"""
+<div class="bm-course-restrictions">
+  <div class="row"><div class="first-column">Age Restrictions</div><div class="second-column">{e['ages']}</div></div>
+</div>
+<div class="bm-course-prices">
+  <div class="row">
+    <div class="first-column">Adult</div>
+    <div class="second-column"><div class="bm-price-tag">{e['fee']}</div></div>
+  </div>
+</div>
+<div class="bm-event-info">
+  <span aria-label="Event date {date.strftime('%d-%b-%Y')}">{date.strftime('%d-%b-%Y')}</span>
+  <span aria-label="Event time {e['eventTime']}">{e['eventTime']}</span>
+</div>""")
+
+
+def render_page(title, body):
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<div id="app">{body}
+</div>
+</body>
+</html>
+"""
+
+
+def render_burnaby_list(events):
+    return render_page("Activity Search", "".join(render_burnaby_card(event) for event in events))
+
+
+def render_newwest_list(events):
+    return render_page("Classes", "".join(render_newwest_session(event) for event in events))
+
+
+def write_fixture(city, name, content):
+    path = os.path.join(FIXTURE_DIR, city, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return path
+
+
+def main():
+    print(write_fixture("burnaby", "list.html", render_burnaby_list(load_sessions("burnaby"))))
+    print(write_fixture("newwest", "list.html", render_newwest_list(load_sessions("newwest"))))
+    for event in load_sessions("newwest"):
+        write_fixture("newwest", os.path.join("details", detail_fixture_name(event["eventLink"])), render_newwest_detail(event))
+    print(os.path.join(FIXTURE_DIR, "newwest", "details"))
+
+
+if __name__ == "__main__":
+    main()
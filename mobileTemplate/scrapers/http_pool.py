@@ -0,0 +1,31 @@
+# http_pool.py
+"""Shared keep-alive HTTP session for the scrapers that talk to booking sites without a browser."""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def make_session(pool_size=8, retries=3, backoff=0.5):
+    """
+    Create a requests session whose connection pool can serve `pool_size` threads at once.
+    Transient failures (429 / 5xx / dropped connections) are retried with exponential backoff.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=None,  # the activity search endpoint is a POST, retry it too
+    )
+    # retries=0 leaves retrying to the caller (engine.py retries through its rate limiter)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry if retries else 0)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
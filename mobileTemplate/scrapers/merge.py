@@ -0,0 +1,124 @@
+# merge.py
+"""
+Merge every city's *-drop-in-sessions.json into volleyball_sessions.json (replaces scripts/combine-json-files.js).
+
+Each event gets one numeric sort key, its start time in epoch seconds, computed once.
+Every city's list is already in date order (or is put in order once), so the lists are
+combined with a k-way heap merge: O(n log k) for k cities instead of re-sorting everything.
+Duplicates (same city and session) keep their first occurrence.
+
+Usage: python merge.py
+"""
+import calendar
+import glob
+import heapq
+import json
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import columnar
+import ndjson_sink
+import query_index
+import utils
+from event_cache import event_key
+
+COMBINED_FILE = "volleyball_sessions.json"
+CITY_FILE_PATTERN = "*-drop-in-sessions.json"
+
+# Events without a parseable date go last
+UNKNOWN_START = 2 ** 63 - 1
+
+
+@lru_cache(maxsize=4096)
+def start_epoch(eventDate, eventTime):
+    """Start of a session in epoch seconds (wall-clock time treated as UTC, so it only orders)"""
+    try:
+        start = datetime.strptime(eventDate, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return UNKNOWN_START
+
+    parsed = start_time(eventTime)
+    if parsed is not None:
+        start = start.replace(hour=parsed.hour, minute=parsed.minute)
+    else:
+        start += timedelta(days=1, seconds=-1)  # unknown time: after everything else that day
+    return calendar.timegm(start.timetuple())
+
+
+def start_time(eventTime):
+    """The start of an "7:00 PM - 9:00 PM" time range as a datetime, or None when it can't be read"""
+    try:
+        return datetime.strptime((eventTime or "").split(" - ")[0].strip(), "%I:%M %p")
+    except ValueError:
+        return None
+
+
+def wall_clock_epoch(now=None):
+    """The current local time (or `now`, a timestamp) on the same scale as start_epoch"""
+    moment = datetime.fromtimestamp(now) if now is not None else datetime.now()
+    return calendar.timegm(moment.timetuple())
+
+
+def sort_key(event):
+    """Order by real start time ("3:30 PM" sorts after "10:00 AM")"""
+    return start_epoch(event.get("eventDate"), event.get("eventTime"))
+
+
+def discover(data_dir=None):
+    """Every city output in the data directory, as {city: path}"""
+    paths = sorted(glob.glob(os.path.join(data_dir or utils.DATA_DIR, CITY_FILE_PATTERN)))
+    return {os.path.basename(path)[:-len("-drop-in-sessions.json")]: path for path in paths}
+
+
+def keyed(events):
+    """[(sort key, event)] in order; only sorts when a list turns out not to be ordered already"""
+    pairs = [(sort_key(event), event) for event in events]
+    if any(pairs[i][0] > pairs[i + 1][0] for i in range(len(pairs) - 1)):
+        pairs.sort(key=lambda pair: pair[0])
+    return pairs
+
+
+def merge_streams(event_lists):
+    """Yield the events of several lists in start-time order, without duplicates"""
+    seen = set()
+    for _, event in heapq.merge(*map(keyed, event_lists), key=lambda pair: pair[0]):
+        identity = (event.get("city"), event_key(event))
+        if identity in seen:
+            continue
+        seen.add(identity)
+        yield event
+
+
+def write_combined(events, data_dir=None):
+    file_path = os.path.join(data_dir or utils.DATA_DIR, COMBINED_FILE)
+    with utils.atomic_open(file_path) as f:
+        ndjson_sink.write_json_array(events, f, indent=2)
+
+    # Columnar / NDJSON copies for readers that don't need the whole pretty-printed file,
+    # and the search index over the same session order
+    columnar.write_compact(events, file_path)
+    query_index.write_index(events, file_path)
+    return file_path
+
+
+def merge_event_lists(event_lists, data_dir=None):
+    combined = list(merge_streams(event_lists))
+    file_path = write_combined(combined, data_dir)
+    print(f"Combined {len(combined)} sessions into {file_path}")
+    return combined
+
+
+def merge_files(data_dir=None):
+    """Merge whatever city outputs exist on disk"""
+    event_lists = []
+    for city, path in discover(data_dir).items():
+        with open(path) as f:
+            events = json.load(f)
+        print(f"{city}: {len(events)} sessions")
+        event_lists.append(events)
+    return merge_event_lists(event_lists, data_dir)
+
+
+if __name__ == "__main__":
+    merge_files()
@@ -0,0 +1,170 @@
+# metrics.py
+"""
+Per-run timers and counters for the scrapers, exported as JSON logs and (optionally) a
+Prometheus textfile.
+
+    with metrics.run("burnaby"):
+        with metrics.timer("page_load"):
+            driver.get(url)
+        metrics.count("events_scraped", len(events))
+
+Every `metrics.run` writes one JSON "run_finished" line to stderr when it ends, whether it
+succeeded or raised; failures also log the traceback, so nothing fails silently. Set
+METRICS_TEXTFILE_DIR (e.g. node_exporter's --collector.textfile.directory) to also write
+<dir>/spikeconnect_<job>.prom after every run, including the time of the last successful run
+so stale data can be alerted on.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+TEXTFILE_DIR = os.environ.get("METRICS_TEXTFILE_DIR")
+PREFIX = "spikeconnect"
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_labels(labels):
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}" if labels else ""
+
+
+class Registry:
+    """Stage timings (calls / total / max seconds) and counters, keyed by name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+
+    def observe(self, stage, seconds, **labels):
+        with self._lock:
+            stats = self.timers.setdefault(_key(stage, labels), [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def count(self, name, value=1, **labels):
+        with self._lock:
+            key = _key(name, labels)
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def snapshot(self):
+        with self._lock:
+            timers = [
+                {"stage": name, **dict(labels), "calls": calls, "seconds": round(total, 4), "max_seconds": round(longest, 4)}
+                for (name, labels), (calls, total, longest) in self.timers.items()
+            ]
+            counters = [{"name": name, **dict(labels), "value": value} for (name, labels), value in self.counters.items()]
+        return {"timers": timers, "counters": counters}
+
+    def prometheus_lines(self, job):
+        job_label = (("job", job),)
+        with self._lock:
+            timers = list(self.timers.items())
+            counters = list(self.counters.items())
+
+        lines = [f"# TYPE {PREFIX}_stage_seconds gauge", f"# TYPE {PREFIX}_stage_calls gauge",
+                 f"# TYPE {PREFIX}_stage_max_seconds gauge"]
+        for (name, labels), (calls, total, longest) in sorted(timers):
+            label_text = _format_labels(job_label + (("stage", name),) + labels)
+            lines.append(f"{PREFIX}_stage_seconds{label_text} {total:.6f}")
+            lines.append(f"{PREFIX}_stage_calls{label_text} {calls}")
+            lines.append(f"{PREFIX}_stage_max_seconds{label_text} {longest:.6f}")
+        typed = set()
+        for (name, labels), value in sorted(counters):
+            if name not in typed:
+                lines.append(f"# TYPE {PREFIX}_{name} gauge")
+                typed.add(name)
+            lines.append(f"{PREFIX}_{name}{_format_labels(job_label + labels)} {value}")
+        return lines
+
+
+# One registry per process: each orchestrator worker runs one city at a time
+registry = Registry()
+observe = registry.observe
+timer = registry.timer
+count = registry.count
+
+
+def log(event, level="info", **fields):
+    """Write one structured JSON log line to stderr"""
+    record = {"ts": round(time.time(), 3), "level": level, "event": event, **fields}
+    print(json.dumps(record, default=str), file=sys.stderr, flush=True)
+
+
+def _last_success(path, job):
+    """Previous last-success timestamp from an existing textfile, so a failed run keeps it"""
+    try:
+        with open(path) as f:
+            match = re.search(rf'^{PREFIX}_last_success_timestamp_seconds\{{job="{re.escape(job)}"\}} (\S+)$', f.read(), re.M)
+        return float(match.group(1)) if match else None
+    except OSError:
+        return None
+
+
+def write_textfile(job, ok, seconds, textfile_dir=None):
+    textfile_dir = textfile_dir or TEXTFILE_DIR
+    if not textfile_dir:
+        return None
+
+    path = os.path.join(textfile_dir, f"{PREFIX}_{job}.prom")
+    last_success = time.time() if ok else _last_success(path, job)
+    job_label = _format_labels((("job", job),))
+
+    lines = registry.prometheus_lines(job) + [
+        f"# TYPE {PREFIX}_run_duration_seconds gauge",
+        f"{PREFIX}_run_duration_seconds{job_label} {seconds:.3f}",
+        f"# TYPE {PREFIX}_run_success gauge",
+        f"{PREFIX}_run_success{job_label} {int(ok)}",
+    ]
+    if last_success is not None:
+        lines += [f"# TYPE {PREFIX}_last_success_timestamp_seconds gauge",
+                  f"{PREFIX}_last_success_timestamp_seconds{job_label} {last_success:.0f}"]
+
+    # Written atomically: the textfile collector must never read a half-written file
+    os.makedirs(textfile_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+    return path
+
+
+@contextmanager
+def run(job):
+    """Time a whole scraper run, then export its metrics (on success and on failure)"""
+    registry.reset()
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield registry
+        ok = True
+    except Exception as e:
+        log("run_failed", level="error", job=job, error=repr(e), traceback=traceback.format_exc())
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        log("run_finished", job=job, ok=ok, seconds=round(seconds, 3), **registry.snapshot())
+        try:
+            write_textfile(job, ok, seconds)
+        except OSError as e:
+            log("textfile_failed", level="error", job=job, error=repr(e))
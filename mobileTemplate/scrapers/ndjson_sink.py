@@ -0,0 +1,96 @@
+# ndjson_sink.py
+"""
+Streaming newline-delimited JSON output.
+
+`NDJSONSink` writes each event as one line as soon as it is handed over, into a temp file that
+is fsynced and atomically renamed into place when the run completes (or deleted if it fails),
+so a crash never leaves a truncated file behind. Paths ending in ".gz" are gzip-compressed.
+
+Both scrapers and engine.py stream every run into <city>-drop-in-sessions.ndjson from their
+parse / normalize loops, one line per event as soon as it is complete. It is the line-oriented
+copy of the city's JSON file; merge.py still combines the JSON arrays.
+
+This makes output incremental and crash-safe, not memory-constant: the engine and the scrapers
+still keep each run's full list, because the cache diff, the JSON/SQLite output and the merge
+all need it. `write_json_array` writes that list as the app's JSON array without building
+the whole string first.
+"""
+import gzip
+import json
+import os
+
+import utils
+from event_record import to_json
+
+
+def ndjson_path(city, compress=False):
+    return os.path.join(utils.DATA_DIR, f"{city}-drop-in-sessions.ndjson" + (".gz" if compress else ""))
+
+
+class NDJSONSink:
+    def __init__(self, path, compress=None):
+        self.path = path
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.count = 0
+        self.compress = path.endswith(".gz") if compress is None else compress
+
+        self._file = open(self.tmp_path, "wb")
+        self._open_stream()
+
+    def _open_stream(self):
+        self._stream = gzip.GzipFile(fileobj=self._file, mode="wb") if self.compress else self._file
+
+    def write(self, event):
+        line = json.dumps(event, separators=(",", ":"), ensure_ascii=False, default=to_json)
+        self._stream.write(line.encode("utf-8") + b"\n")
+        self.count += 1
+
+    def write_many(self, events):
+        for event in events:
+            self.write(event)
+        self._stream.flush()
+
+    def restart(self):
+        """Drop everything written so far, e.g. when a scraper falls back to another engine"""
+        if self._stream is not self._file:
+            self._stream.close()
+        self._file.seek(0)
+        self._file.truncate()
+        self.count = 0
+        self._open_stream()
+
+    def close(self):
+        """Finish the file and move it into place"""
+        if self._stream is not self._file:
+            self._stream.close()  # writes the gzip trailer, leaves the underlying file open
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Drop the partial output, keeping whatever file was there before"""
+        self._file.close()
+        os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_json_array(events, f, indent=4):
+    """Write an iterable of events as `json.dump(list(events), f, indent=indent)` would, one event at a time"""
+    padding = " " * indent
+    first = True
+    for event in events:
+        f.write("[\n" if first else ",\n")
+        text = json.dumps(event, indent=indent, default=to_json)
+        f.write("\n".join(padding + line for line in text.split("\n")))
+        first = False
+    f.write("[]" if first else "\n]")
+
@@ -0,0 +1,450 @@
+# newwest_drop_in_scraper.py
+"""
+New Westminster (PerfectMind) drop-in volleyball scraper.
+
+Importing this module is cheap: Selenium, requests and BeautifulSoup are only loaded on the
+code paths that use them, so the parsing helpers can be reused and timed on their own.
+
+Usage: python newwest_drop_in_scraper.py [--start YYYY-MM-DD] [--end YYYY-MM-DD] [--shard week|month|none] [--partial]
+       python newwest_drop_in_scraper.py --parse-only saved-list.html
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+import argparse
+import calendar
+import json
+import sys
+import utils
+from event_record import Event, to_json
+import perfectmind
+import event_cache
+import driver_pool
+import readiness
+import metrics
+import ndjson_sink
+import sqlite_sink
+import parsing
+import re
+
+# URL to scrape for volleyball drop-in events
+volleyball_url = 'https://cityofnewwestminster.perfectmind.com/23693/Clients/BookMe4BookingPages/Classes?calendarId=510214f6-df2d-4ead-9caf-e3883d73d090&widgetId=2edd14d7-7dee-4a06-85e1-e211553c48d5&embed=False'
+
+# New Westminster drop-in volleyball base URL
+base_url = "https://cityofnewwestminster.perfectmind.com"
+
+# How many detail pages are fetched at the same time
+DETAIL_WORKERS = 8
+
+# The date range is loaded in week- or month-sized shards, in parallel on pooled browsers.
+# A shard that fails is retried on its own; if it keeps failing its sessions are kept from the last run.
+# With a single pooled browser (DRIVER_POOL_SIZE=1) shards would load one after another, about
+# three times the page work of one range, so the whole range is loaded as one page instead.
+SHARD_WORKERS = driver_pool.DEFAULT_POOL_SIZE
+SHARD_SIZE = "month" if SHARD_WORKERS > 1 else None
+SHARD_RETRIES = 2
+
+# One of these per class session in the list
+SESSION_SELECTOR = 'div.bm-class-container'
+
+def build_event(session):
+    """
+    Turn the raw fields of one class container (see parsing.parse_newwest_sessions) into an Event record.
+    Ages, fee, date and time come from the detail page and are filled in later;
+    day of week, venue type, level and status by utils.normalize_events.
+    """
+    title = session['title'].strip()
+
+    # Extract event ID
+    eventID = session['number'].strip().replace('#', '')
+
+    # Extract the number of openings
+    if session['spots'] is not None:
+        openings = session['spots'].split()[0]  # Extract the number of spots
+    else:
+        openings = "Unspecified"
+
+    # Extract the event link from the register button's 'onclick' value
+    eventLink = None
+    match = re.search(r"\'([^\']+)\'", session['onclick'] or '')
+    if match:
+        relative_url = match.group(1)
+        eventLink = base_url + relative_url
+
+    # Locate the location text
+    location_text = session['location'].strip()
+    location = location_text.split('-')[0].strip() if '-' in location_text else location_text
+
+    if not eventLink:
+        return None
+
+    return Event(
+        title=title,
+        eventID=eventID,
+        location=location,
+        city='New Westminster',
+        eventLink=eventLink,
+        venueType=None,
+        category='Drop-in',
+        level=None,
+        ages=None,
+        openings=openings,
+        status=None,
+        eventDate=None,
+        eventTime=None,
+        dayOfWeek=None,
+        fee=None
+    )
+
+def month_end(day):
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+def default_range(today=None):
+    """Today through the end of the month after next, the range this scraper has always covered"""
+    today = today or date.today()
+    month = today.month + 1  # zero-based month after next, before wrapping into the next year
+    return today, month_end(date(today.year + month // 12, month % 12 + 1, 1))
+
+def date_range(start=None, end=None):
+    """start..end with default_range filling in what's missing; a range that runs backwards is an error"""
+    default_start, default_end = default_range()
+    start, end = start or default_start, end or default_end
+    if start > end:
+        raise ValueError(f"Start date {start} is after end date {end}")
+    return start, end
+
+def date_shards(start, end, size=SHARD_SIZE):
+    """Split start..end (inclusive) into Monday-Sunday weeks or calendar months; size None keeps one range"""
+    shards = []
+    while start <= end:
+        if size is None:
+            shard_end = end
+        elif size == "week":
+            shard_end = start + timedelta(days=6 - start.weekday())
+        elif size == "month":
+            shard_end = month_end(start)
+        else:
+            raise ValueError(f"Unknown shard size: {size}")
+        shards.append((start, min(shard_end, end)))
+        start = shard_end + timedelta(days=1)
+    return shards
+
+def calendar_value(day):
+    """A day's data-value in the calendar popup, which counts months from 0 ("2025/0/31" is January 31)"""
+    return f"{day.year}/{day.month - 1}/{day.day}"
+
+def visible_element(driver, css_selector):
+    """First displayed match: each date field has its own calendar popup, hidden while closed"""
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+
+    for element in driver.find_elements(By.CSS_SELECTOR, css_selector):
+        if element.is_displayed():
+            return element
+    raise NoSuchElementException(css_selector)
+
+def select_date(driver, field, day):
+    """Pick `day` in the calendar of the dateFrom or dateTo field"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    date_input = driver.find_element(By.CSS_SELECTOR, f'input[aria-labelledby="{field}"]')
+    # Find the calendar icon specifically for this field
+    calendar_icon = date_input.find_element(By.XPATH, './following-sibling::span//span[contains(@class, "k-i-calendar")]')
+    calendar_icon.click()
+    WebDriverWait(driver, 5).until(lambda d: visible_element(d, 'a.k-nav-fast'))
+
+    # Move the calendar from the month it shows (e.g. "August 2025") to the wanted one
+    shown = datetime.strptime(visible_element(driver, 'a.k-nav-fast').text, "%B %Y")
+    months = (day.year - shown.year) * 12 + day.month - shown.month
+    action = "next" if months > 0 else "prev"
+    for _ in range(abs(months)):
+        button = visible_element(driver, f'a[data-action="{action}"][role="button"]')
+        driver.execute_script("arguments[0].click();", button)
+
+    day_selector = f'a.k-link[data-value="{calendar_value(day)}"]'
+    WebDriverWait(driver, 5).until(lambda d: visible_element(d, day_selector))
+    visible_element(driver, day_selector).click()
+
+    # The session list reloads for the new range
+    readiness.wait_for_network_idle(driver, f"{field} reload", timeout=10)
+
+def load_session_list(driver, start=None, end=None):
+    """
+    Open the class list, filter it to drop-in volleyball and narrow it to start..end
+    (default: see default_range). Returns the rendered page source.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    default_start, default_end = default_range()
+    start, end = start or default_start, end or default_end
+
+    # Open the URL
+    with metrics.timer("page_load"):
+        driver.get(volleyball_url)
+    readiness.track_requests(driver)
+
+    # Narrow the list to drop-in volleyball and the date range
+    with metrics.timer("filter"):
+        service_filter = WebDriverWait(driver, 5).until(
+            EC.visibility_of_element_located((By.CSS_SELECTOR, 'div[aria-label="Service"]'))
+        )
+        service_filter.click()
+
+        service_filter_input = driver.find_element(By.XPATH, "//input[@aria-label='Enter text to search for filter values']")
+        service_filter_input.send_keys('v')
+
+        volleyball_checkbox = driver.find_element(By.XPATH, "//label[text() = 'Volleyball - Drop-in']")
+        volleyball_checkbox.click()
+        readiness.wait_for_network_idle(driver, "volleyball filter", timeout=5)
+        readiness.wait_for_stable_count(driver, SESSION_SELECTOR, "filtered sessions", timeout=5)
+
+        # End date first, so the range never runs backwards while the start date moves forward
+        try:
+            select_date(driver, "dateTo", end)
+            select_date(driver, "dateFrom", start)
+            print(f"Selected sessions from {start} to {end}")
+        except Exception as e:
+            print(f"Error selecting dates {start} to {end}: {e}")
+            raise
+        readiness.wait_for_stable_count(driver, SESSION_SELECTOR, "date range sessions", timeout=10)
+
+    return driver.page_source
+
+def render_shard(driver, start, end, retries=SHARD_RETRIES):
+    """load_session_list for one shard, retrying just that shard"""
+    for attempt in range(retries + 1):
+        try:
+            return load_session_list(driver, start, end)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            print(f"Retrying sessions from {start} to {end} ({e})")
+            metrics.count("shard_retries")
+
+def load_shard(start, end):
+    """Load and parse the class list of one shard on its own pooled browser"""
+    with driver_pool.lease() as driver:
+        page_source = render_shard(driver, start, end)
+    with metrics.timer("parse"):
+        sessions = parsing.parse_newwest_sessions(page_source)
+        return [event for event in map(build_event, sessions) if event]
+
+def parse_saved_page(path):
+    """
+    Run the parsing path on a saved class list page: no browser, no network, nothing saved.
+    Ages, fee, date and time live on the detail pages, so they stay empty.
+    """
+    with open(path, encoding="utf-8") as f:
+        page_source = f.read()
+    with metrics.timer("parse"):
+        events = [event for event in map(build_event, parsing.parse_newwest_sessions(page_source)) if event]
+    utils.normalize_events(events, source="newwest")
+    return events
+
+def previous_events(start, end):
+    """Sessions between start and end from the last saved run, standing in for a shard that failed"""
+    first, last = start.isoformat(), end.isoformat()
+    return [Event.from_dict(event) for event in utils.load_from_json("newwest")
+            if first <= (event.get("eventDate") or "") <= last]
+
+def saved_outside(start, end, keys):
+    """
+    Sessions from the last saved run that a partial scrape of start..end doesn't cover:
+    later ones and ones without a known date. Past sessions drop off as they always have.
+    """
+    first, last, today = start.isoformat(), end.isoformat(), date.today().isoformat()
+    kept = []
+    for event in utils.load_from_json("newwest"):
+        day = event.get("eventDate") or ""
+        if event_cache.event_key(event) in keys:
+            continue
+        if day[:1].isdigit() and (day < today or first <= day <= last):
+            continue
+        kept.append(Event.from_dict(event))
+    return kept
+
+def load_sessions(start=None, end=None, shard_size=SHARD_SIZE):
+    """
+    Load the class list shard by shard, in parallel, and merge the shards by event_key.
+    Returns (events, carried): `carried` holds the keys of complete events taken over from the
+    last run for shards that still failed after their retries.
+    """
+    shards = date_shards(*date_range(start, end), shard_size)
+    metrics.count("shards", len(shards))
+
+    events = {}
+    carried = set()
+    failed = 0
+    with ThreadPoolExecutor(max_workers=min(SHARD_WORKERS, len(shards))) as pool:
+        futures = [pool.submit(load_shard, *shard) for shard in shards]
+        for (shard_start, shard_end), future in zip(shards, futures):
+            try:
+                shard_events = future.result()
+            except Exception as e:
+                print(f"Sessions from {shard_start} to {shard_end} failed, keeping the last run's ({e})")
+                metrics.count("shards_failed")
+                failed += 1
+                shard_events = previous_events(shard_start, shard_end)
+                carried.update(event_cache.event_key(event) for event in shard_events
+                               if event_cache.event_key(event) not in events)
+            for event in shard_events:
+                events.setdefault(event_cache.event_key(event), event)
+
+    if failed == len(shards):
+        raise RuntimeError("Every date range failed to load")
+    return list(events.values()), carried
+
+def scrape_volleyball_events(start=None, end=None, shard_size=SHARD_SIZE, partial=False):
+    """
+    Scrape start..end (default: see default_range) and save it. With `partial` the range only
+    refreshes part of the saved sessions (see saved_outside); otherwise it replaces them.
+    """
+    try:
+        # Events are streamed to newwest-drop-in-sessions.ndjson as soon as their details are
+        # known; the file is only moved into place once the run has been saved
+        with metrics.run("newwest"), ndjson_sink.NDJSONSink(ndjson_sink.ndjson_path("newwest")) as sink:
+            readiness.recorder.reset()
+
+            events, carried = load_sessions(start, end, shard_size)
+
+            # An empty list means the page changed or didn't load; keep the last good file
+            if not events:
+                raise RuntimeError("No matching volleyball events found")
+
+            def complete(event, details=None):
+                if details:
+                    ages, fee, eventDate, eventTime = details
+                    event.update({
+                        'ages': ages,
+                        'eventDate': eventDate,
+                        'eventTime': eventTime,
+                        'fee': fee
+                    })
+                with metrics.timer("normalize"):
+                    utils.normalize_events([event], source="newwest")
+                sink.write(event)
+
+            # Known sessions reuse their cached details; only new ones need their detail page.
+            # A class's eventID repeats for every occurrence, so everything is keyed by occurrence link.
+            cache = event_cache.EventCache("newwest")
+            by_key = {event_cache.event_key(event): event for event in events}
+            links = {}
+            cache_hits = 0
+            for key, event in by_key.items():
+                if key in carried:
+                    complete(event)
+                    continue
+                cached = cache.get(key)
+                if cached:
+                    complete(event, (cached['ages'], cached['fee'], cached['eventDate'], cached['eventTime']))
+                    cache_hits += 1
+                else:
+                    links[key] = event['eventLink']
+            print(f"Reusing cached details for {cache_hits} events")
+            metrics.count("detail_cache_hits", cache_hits)
+
+            # Resolve the new detail pages through a bounded worker pool
+            with metrics.timer("detail_pages"):
+                fetched = perfectmind.fetch_details(links, workers=DETAIL_WORKERS,
+                                                    on_result=lambda key, details: complete(by_key[key], details))
+            print(f"Fetched {len(fetched)} of {len(links)} new detail pages over HTTP")
+
+            # Fall back to opening the page in the browser if the HTTP fetch didn't work
+            missing = [key for key in links if key not in fetched]
+            if missing:
+                with driver_pool.lease() as driver:
+                    for key in missing:
+                        complete(by_key[key], get_details_and_return(driver, links[key]))
+            metrics.count("events_scraped", len(events))
+
+            if partial:
+                kept = saved_outside(*date_range(start, end), set(by_key))
+                print(f"Keeping {len(kept)} saved sessions outside the scraped range")
+                sink.write_many(kept)
+                events += kept
+
+            print(readiness.recorder.summary())
+            with metrics.timer("save"):
+                event_cache.record_run(events, "newwest", cache)
+                utils.save_to_json(events, "newwest")
+            sqlite_sink.try_save_to_sqlite(events, "newwest")
+            return events
+
+    except Exception as e:
+        # metrics.run has already logged the traceback and exported the failed run
+        print(f"Error scraping events: {e}")
+
+@metrics.timer("get_details_and_return")
+def get_details_and_return(driver, eventLink):
+    """Click the details button and return to the original page"""
+    from selenium.webdriver.common.by import By
+
+    try:
+        # Open the details page in a new tab
+        driver.execute_script(f"window.open('{eventLink}', '_blank');")
+        
+        # Switch to the new tab
+        driver.switch_to.window(driver.window_handles[-1])
+
+        # Extract the age text
+        age_element = driver.find_element("xpath", "//div[contains(@class, 'bm-course-restrictions')]//div[contains(@class, 'row')]//div[contains(@class, 'second-column')]")
+        age_text = age_element.text
+
+        # Extract the adult fee
+        fee_element = driver.find_element("xpath", "//div[contains(@class, 'bm-course-prices')]//div[contains(@class, 'row')]//div[contains(@class, 'first-column')][contains(text(), 'Adult')]/following-sibling::div//div[contains(@class, 'bm-price-tag')]")
+        fee_text = fee_element.text
+
+        # Find the time and date
+        date_time_span = driver.find_element(By.XPATH, "//span[contains(@aria-label, 'Event date')]")
+        raw_date = date_time_span.text
+        eventDate = perfectmind.format_event_date(raw_date)
+
+        time_span = driver.find_element(By.XPATH, "//span[contains(@aria-label, 'Event time')]")
+        eventTime = time_span.text.upper()
+
+        # Close the details tab
+        driver.close()
+        
+        # Switch back to the main tab
+        driver.switch_to.window(driver.window_handles[0])
+
+        return age_text, fee_text, eventDate, eventTime
+        
+    except Exception as e:
+        print(f"Error in get_details_and_return: {e}")
+        metrics.count("detail_browser_failures")
+        # Make sure we switch back to the main tab even if there's an error
+        if len(driver.window_handles) > 1:
+            driver.close()
+            driver.switch_to.window(driver.window_handles[0])
+        return "Unknown", "Unknown", "Unknown", "Unknown"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape New Westminster drop-in volleyball sessions.")
+    parser.add_argument("--start", type=date.fromisoformat, help="first day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last day, YYYY-MM-DD (default: end of the month after next)")
+    parser.add_argument("--shard", choices=["week", "month", "none"], default=SHARD_SIZE or "none",
+                        help="load the range in week or month pieces, in parallel (none: one page; "
+                             "the default with a single pooled browser)")
+    parser.add_argument("--partial", action="store_true",
+                        help="keep the saved sessions outside --start..--end instead of replacing them")
+    parser.add_argument("--parse-only", metavar="HTML",
+                        help="parse a saved class list page and print its events as JSON (no browser, no network)")
+    args = parser.parse_args(argv)
+    try:
+        date_range(args.start, args.end)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.parse_only:
+        events = parse_saved_page(args.parse_only)
+        json.dump(events, sys.stdout, indent=4, default=to_json)
+        print()
+        return events
+    return scrape_volleyball_events(args.start, args.end, None if args.shard == "none" else args.shard, args.partial)
+
+# Run the scraper
+if __name__ == "__main__":
+    main()
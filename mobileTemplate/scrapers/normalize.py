@@ -0,0 +1,155 @@
+# normalize.py
+"""
+Fast, memoized normalization of scraped event fields.
+
+Dates, locations and titles repeat heavily within a scrape (a few venues, a handful of
+titles, ~60 distinct dates), so every function here caches its results in a bounded LRU.
+Date parsing remembers which format matched last for each source and tries it first
+(except the day/month-ambiguous slash formats, which always resolve month first), and each classifier is a single precompiled regex instead of repeated substring scans.
+
+`normalize_events(events)` fills in the derived fields for a whole scrape in one call;
+`utils.py` re-exports the single-value functions under their original names.
+"""
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+CACHE_SIZE = 4096
+
+DATE_FORMATS = (
+    "%B %d, %Y",  # April 11, 2025
+    "%b %d, %Y",  # Apr 12, 2025
+    "%d-%b-%Y",   # 12-Apr-2025
+    "%Y-%m-%d",   # 2025-04-12
+    "%m/%d/%Y",   # 04/12/2025
+    "%d/%m/%Y",   # 12/04/2025
+)
+
+# "04/12/2025" parses with both; the order above (month first) must always decide, never history
+AMBIGUOUS_FORMATS = (DATE_FORMATS.index("%m/%d/%Y"), DATE_FORMATS.index("%d/%m/%Y"))
+
+ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# source -> index into DATE_FORMATS of the format that matched last
+_last_format = {}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_date(date_str, first_format):
+    """Return (iso_date, matched_format_index), trying `first_format` before the others"""
+    if ISO_DATE.fullmatch(date_str):
+        try:
+            date.fromisoformat(date_str)
+            return date_str, DATE_FORMATS.index("%Y-%m-%d")
+        except ValueError:
+            pass
+
+    order = list(range(len(DATE_FORMATS)))
+    if first_format not in AMBIGUOUS_FORMATS:
+        order.remove(first_format)
+        order.insert(0, first_format)
+    for i in order:
+        try:
+            return datetime.strptime(date_str, DATE_FORMATS[i]).strftime("%Y-%m-%d"), i
+        except ValueError:
+            continue
+
+    print(f"Error standardizing date: Could not parse date: {date_str}")
+    return date_str, None
+
+
+def standardize_date(date_str, source=None):
+    """
+    Convert various date formats to a standardized ISO format (YYYY-MM-DD).
+    Returns the original string if no format matches.
+    """
+    if not isinstance(date_str, str):
+        return date_str
+    iso_date, matched = _parse_date(date_str, _last_format.get(source, 0))
+    if matched is not None and matched not in AMBIGUOUS_FORMATS:
+        _last_format[source] = matched
+    return iso_date
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def get_day_of_week(date_str):
+    """Full day name (Monday, Tuesday, ...) for a date in any supported format"""
+    iso_date = standardize_date(date_str)
+    try:
+        return date.fromisoformat(iso_date).strftime("%A")
+    except (TypeError, ValueError) as e:
+        print(f"Error getting day of week: {e}")
+        return "Unknown"
+
+
+def _keyword_classifier(rules, default):
+    """
+    Build a classifier from (label, keywords) rules in priority order.
+    One compiled regex finds every keyword; the highest-priority label that matched wins.
+    """
+    label_of = {}
+    for label, keywords in rules:
+        for keyword in keywords:
+            label_of.setdefault(keyword, label)
+    priority = {label: i for i, (label, _) in enumerate(rules)}
+    pattern = re.compile("|".join(sorted(map(re.escape, label_of), key=len, reverse=True)), re.IGNORECASE)
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def classify(text):
+        labels = {label_of[match.group(0).lower()] for match in pattern.finditer(text or "")}
+        return min(labels, key=priority.__getitem__) if labels else default
+
+    return classify
+
+
+get_venue_type_from_location = _keyword_classifier([
+    ("Indoor", ("centre", "complex", "gymnasium", "gym")),
+    ("Beach", ("beach", "sand", "banks")),
+    ("Grass", ("grass",)),
+], "Not Specified")
+
+get_level_from_title = _keyword_classifier([
+    ("Beginner", ("beginner",)),
+    ("Intermediate", ("intermediate",)),
+    ("Advanced", ("advanced",)),
+], "All Levels")
+
+_FULL = re.compile(r"full", re.IGNORECASE)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def get_status_from_openings(openings):
+    if openings == "0" or _FULL.search(openings):
+        return "Full"
+    return "Open"
+
+
+def normalize_events(events, source=None):
+    """
+    Fill in the derived fields of a whole scrape in one pass (in place):
+    eventDate (ISO), dayOfWeek, venueType, level and status.
+    """
+    venue_type = get_venue_type_from_location
+    level = get_level_from_title
+    status = get_status_from_openings
+    day_of_week = get_day_of_week
+
+    for event in events:
+        event_date = standardize_date(event.get("eventDate"), source)
+        event["eventDate"] = event_date
+        event["dayOfWeek"] = day_of_week(event_date) if event_date else "Unknown"
+        event["venueType"] = venue_type(event.get("location") or "")
+        event["level"] = level(event.get("title") or "")
+        event["status"] = status(str(event.get("openings", "")))
+    return events
+
+
+def cache_info():
+    """Hit/miss statistics for every memoized normalizer"""
+    return {
+        "date": _parse_date.cache_info(),
+        "dayOfWeek": get_day_of_week.cache_info(),
+        "venueType": get_venue_type_from_location.cache_info(),
+        "level": get_level_from_title.cache_info(),
+        "status": get_status_from_openings.cache_info(),
+    }
@@ -0,0 +1,106 @@
+# orchestrator.py
+"""
+Run every city scraper at the same time and merge their output into volleyball_sessions.json.
+A refresh cycle takes about as long as the slowest city instead of the sum of all of them.
+
+Usage: python orchestrator.py [--workers N] [--cities burnaby newwest] [--interval SECONDS]
+
+With --interval the orchestrator keeps running and reuses its worker processes, so each
+worker's warm Chrome instances (see driver_pool.py) survive from one cycle to the next.
+"""
+import argparse
+import importlib
+import multiprocessing.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import driver_pool
+import merge
+import utils
+
+SCRAPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# City key -> scraper module. Add new municipalities here.
+SOURCES = {
+    "newwest": "newwest_drop_in_scraper",
+    "burnaby": "burnaby_drop_in_scraper",
+}
+
+
+def load_scraper(city):
+    """Import a city's scraper module (cheap: browser and HTTP libraries load on first use)."""
+    if SCRAPERS_DIR not in sys.path:
+        sys.path.insert(0, SCRAPERS_DIR)  # so the scraper's own `import utils` resolves
+    return importlib.import_module(SOURCES[city])
+
+
+def run_city(city, **options):
+    """Worker entry point: scrape one city and return (city, events, seconds)."""
+    start = time.perf_counter()
+    events = load_scraper(city).scrape_volleyball_events(**options)
+    return city, events, time.perf_counter() - start
+
+
+def init_worker():
+    """Quit the worker's pooled Chrome instances when the process pool shuts down."""
+    # Pool workers exit without running atexit handlers, but they do run multiprocessing finalizers
+    multiprocessing.util.Finalize(None, driver_pool.shutdown, exitpriority=10)
+
+
+def run_cycle(pool, cities):
+    events_by_city = {}
+    timings = {}
+
+    start = time.perf_counter()
+    futures = {pool.submit(run_city, city): city for city in cities}
+    for future in as_completed(futures):
+        city = futures[future]
+        try:
+            _, events, seconds = future.result()
+        except Exception as e:
+            print(f"Error running {city} scraper: {e}")
+            events, seconds = None, None
+
+        if events is None:
+            print(f"{city}: scrape failed, keeping previously saved sessions")
+            events = utils.load_from_json(city)
+
+        events_by_city[city] = events
+        timings[city] = seconds
+
+    for city in cities:
+        seconds = timings[city]
+        took = f"{seconds:.1f}s" if seconds is not None else "failed"
+        print(f"{city}: {len(events_by_city[city])} events ({took})")
+    print(f"Total wall-clock time: {time.perf_counter() - start:.1f}s")
+
+    # Merge from disk so cities outside this cycle (--cities) stay in the combined file
+    return merge.merge_files()
+
+
+def run_all(cities=None, workers=None, interval=None):
+    cities = cities or list(SOURCES)
+    workers = workers or len(cities)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        while True:
+            combined = run_cycle(pool, cities)
+            if not interval:
+                return combined
+            time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape every city concurrently and merge the results.")
+    parser.add_argument("--workers", type=int, default=None, help="max scrapers running at once (default: one per city)")
+    parser.add_argument("--cities", nargs="+", choices=sorted(SOURCES), help="only scrape these cities")
+    parser.add_argument("--interval", type=int, default=None, help="keep running, starting a new cycle every N seconds")
+    args = parser.parse_args()
+
+    run_all(args.cities, args.workers, args.interval)
+
+
+if __name__ == "__main__":
+    main()
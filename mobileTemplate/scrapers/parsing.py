@@ -0,0 +1,257 @@
+# parsing.py
+"""
+Pluggable HTML parsing for the list pages of both scrapers.
+
+Each page is parsed once and every card's raw text fields are pulled out in a single
+traversal. Three backends produce identical output:
+
+    selectolax   - fastest, used when the `selectolax` package is installed
+    lxml         - precompiled XPath expressions over lxml.html
+    html.parser  - the original BeautifulSoup code path (pure Python, always available)
+
+The scrapers turn the raw fields into Event records; see `bench_parsing.py` for timings.
+"""
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    etree = lxml_html = None
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+BURNABY_LABEL_PREFIX = "Reserve In Advance:"
+
+
+def available_backends():
+    available = []
+    if HTMLParser is not None:
+        available.append("selectolax")
+    if lxml_html is not None:
+        available.append("lxml")
+    available.append("html.parser")
+    return available
+
+
+def default_backend():
+    return available_backends()[0]
+
+
+def _text(node):
+    return node.get_text() if node is not None else None
+
+
+# --- html.parser (BeautifulSoup) -------------------------------------------
+
+def _burnaby_cards_bs4(page_html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_html, 'html.parser')
+    cards = []
+
+    for a_tag in soup.find_all('a', {'aria-label': lambda x: x and x.startswith(BURNABY_LABEL_PREFIX)}):
+        card_div = a_tag.find_parent('div', class_='activity-card-info')
+        location_div = card_div.find('div', class_='activity-card-info__location')
+        props_div = card_div.find('div', class_='activity-card-info__props')
+
+        number_span = props_div.find('span', class_='activity-card-info__number')
+        openings_span = props_div.find('span', class_='activity-card-info__openings')
+
+        cards.append({
+            'label': a_tag.get('aria-label'),
+            'href': a_tag.get('href'),
+            'location': _text(location_div.find('span')),
+            'number': _text(number_span.find('span')),
+            'ages': _text(props_div.find('span', class_='activity-card-info__ages')),
+            'openings': _text(openings_span.find('span')),
+            'date': _text(card_div.find('span', class_='activity-card-info__dateRange')),
+            'time': _text(card_div.find('span', class_='activity-card-info__timeRange')),
+        })
+    return cards
+
+
+def _newwest_sessions_bs4(page_html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_html, 'html.parser')
+    sessions = []
+
+    for session in soup.find_all("div", class_="bm-class-container"):
+        header_div = session.find("div", class_="bm-class-header-wrapper")
+        event_id_span = header_div.find("span", class_="bm-event-description",
+                                        attrs={"aria-label": lambda x: x and "event" in x and not "Volleyball" in x})
+        link_div = session.find("div", class_="bm-group-item-link")
+        register_button = link_div.find_all("div")[1].find("input", class_="bm-button")
+        location_div = session.find("div", class_="location-block")
+
+        sessions.append({
+            'title': _text(header_div.find("h3")),
+            'number': _text(event_id_span),
+            'spots': _text(link_div.find("div", class_="bm-spots-left-label").find("span")),
+            'onclick': register_button['onclick'] if register_button else None,
+            'location': _text(location_div.find("span")),
+        })
+    return sessions
+
+
+# --- lxml (precompiled XPath) ----------------------------------------------
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if etree is not None:
+    _XP = {
+        'burnaby_links': etree.XPath(f"//a[starts-with(@aria-label, '{BURNABY_LABEL_PREFIX}')]"),
+        'burnaby_card': etree.XPath(f"ancestor::div[{_has_class('activity-card-info')}][1]"),
+        'burnaby_location': etree.XPath(f"(.//div[{_has_class('activity-card-info__location')}])[1]//span[1]"),
+        'burnaby_props': etree.XPath(f"(.//div[{_has_class('activity-card-info__props')}])[1]"),
+        'burnaby_number': etree.XPath(f"(.//span[{_has_class('activity-card-info__number')}])[1]//span[1]"),
+        'burnaby_ages': etree.XPath(f"(.//span[{_has_class('activity-card-info__ages')}])[1]"),
+        'burnaby_openings': etree.XPath(f"(.//span[{_has_class('activity-card-info__openings')}])[1]//span[1]"),
+        'burnaby_date': etree.XPath(f"(.//span[{_has_class('activity-card-info__dateRange')}])[1]"),
+        'burnaby_time': etree.XPath(f"(.//span[{_has_class('activity-card-info__timeRange')}])[1]"),
+        'newwest_sessions': etree.XPath(f"//div[{_has_class('bm-class-container')}]"),
+        'newwest_header': etree.XPath(f"(.//div[{_has_class('bm-class-header-wrapper')}])[1]"),
+        'newwest_title': etree.XPath("(.//h3)[1]"),
+        'newwest_number': etree.XPath(
+            f"(.//span[{_has_class('bm-event-description')}]"
+            "[contains(@aria-label, 'event') and not(contains(@aria-label, 'Volleyball'))])[1]"),
+        'newwest_link_div': etree.XPath(f"(.//div[{_has_class('bm-group-item-link')}])[1]"),
+        'newwest_spots': etree.XPath(f"(.//div[{_has_class('bm-spots-left-label')}])[1]//span[1]"),
+        'newwest_button': etree.XPath(f"(.//div)[2]//input[{_has_class('bm-button')}][1]"),
+        'newwest_location': etree.XPath(f"(.//div[{_has_class('location-block')}])[1]//span[1]"),
+    }
+
+
+def _first_text_lxml(xpath, node):
+    found = _XP[xpath](node)
+    return found[0].text_content() if found else None
+
+
+def _burnaby_cards_lxml(page_html):
+    root = lxml_html.fromstring(page_html)
+    cards = []
+
+    for a_tag in _XP['burnaby_links'](root):
+        card_div = _XP['burnaby_card'](a_tag)[0]
+        props_div = _XP['burnaby_props'](card_div)[0]
+        cards.append({
+            'label': a_tag.get('aria-label'),
+            'href': a_tag.get('href'),
+            'location': _first_text_lxml('burnaby_location', card_div),
+            'number': _first_text_lxml('burnaby_number', props_div),
+            'ages': _first_text_lxml('burnaby_ages', props_div),
+            'openings': _first_text_lxml('burnaby_openings', props_div),
+            'date': _first_text_lxml('burnaby_date', card_div),
+            'time': _first_text_lxml('burnaby_time', card_div),
+        })
+    return cards
+
+
+def _newwest_sessions_lxml(page_html):
+    root = lxml_html.fromstring(page_html)
+    sessions = []
+
+    for session in _XP['newwest_sessions'](root):
+        header_div = _XP['newwest_header'](session)[0]
+        link_div = _XP['newwest_link_div'](session)[0]
+        button = _XP['newwest_button'](link_div)
+        sessions.append({
+            'title': _first_text_lxml('newwest_title', header_div),
+            'number': _first_text_lxml('newwest_number', header_div),
+            'spots': _first_text_lxml('newwest_spots', link_div),
+            'onclick': button[0].get('onclick') if button else None,
+            'location': _first_text_lxml('newwest_location', session),
+        })
+    return sessions
+
+
+# --- selectolax ------------------------------------------------------------
+
+def _first_text_lexbor(node, selector):
+    found = node.css_first(selector) if node is not None else None
+    return found.text(deep=True) if found is not None else None
+
+
+def _burnaby_cards_selectolax(page_html):
+    tree = HTMLParser(page_html)
+    cards = []
+
+    for a_tag in tree.css(f'a[aria-label^="{BURNABY_LABEL_PREFIX}"]'):
+        card_div = a_tag.parent
+        while card_div is not None and not (card_div.tag == 'div' and
+                                            'activity-card-info' in (card_div.attributes.get('class') or '').split()):
+            card_div = card_div.parent
+        props_div = card_div.css_first('div.activity-card-info__props')
+        cards.append({
+            'label': a_tag.attributes.get('aria-label'),
+            'href': a_tag.attributes.get('href'),
+            'location': _first_text_lexbor(card_div, 'div.activity-card-info__location span'),
+            'number': _first_text_lexbor(props_div, 'span.activity-card-info__number span'),
+            'ages': _first_text_lexbor(props_div, 'span.activity-card-info__ages'),
+            'openings': _first_text_lexbor(props_div, 'span.activity-card-info__openings span'),
+            'date': _first_text_lexbor(card_div, 'span.activity-card-info__dateRange'),
+            'time': _first_text_lexbor(card_div, 'span.activity-card-info__timeRange'),
+        })
+    return cards
+
+
+def _newwest_sessions_selectolax(page_html):
+    tree = HTMLParser(page_html)
+    sessions = []
+
+    for session in tree.css('div.bm-class-container'):
+        header_div = session.css_first('div.bm-class-header-wrapper')
+        number = None
+        for span in header_div.css('span.bm-event-description'):
+            label = span.attributes.get('aria-label') or ''
+            if 'event' in label and 'Volleyball' not in label:
+                number = span.text(deep=True)
+                break
+
+        link_div = session.css_first('div.bm-group-item-link')
+        divs = [node for node in link_div.iter() if node.tag == 'div']
+        button = divs[1].css_first('input.bm-button') if len(divs) > 1 else None
+        sessions.append({
+            'title': _first_text_lexbor(header_div, 'h3'),
+            'number': number,
+            'spots': _first_text_lexbor(link_div.css_first('div.bm-spots-left-label'), 'span'),
+            'onclick': button.attributes.get('onclick') if button is not None else None,
+            'location': _first_text_lexbor(session.css_first('div.location-block'), 'span'),
+        })
+    return sessions
+
+
+_PARSERS = {
+    "selectolax": (_burnaby_cards_selectolax, _newwest_sessions_selectolax),
+    "lxml": (_burnaby_cards_lxml, _newwest_sessions_lxml),
+    "html.parser": (_burnaby_cards_bs4, _newwest_sessions_bs4),
+}
+
+
+def _parser(backend, index):
+    backend = backend or default_backend()
+    if backend not in available_backends():
+        raise ValueError(f"Parser backend '{backend}' is not available (installed: {', '.join(available_backends())})")
+    return _PARSERS[backend][index]
+
+
+def parse_burnaby_cards(page_html, backend=None):
+    """
+    Raw fields of every ActiveCommunities activity card:
+    label, href, location, number, ages, openings, date, time (None when missing)
+    """
+    return _parser(backend, 0)(page_html)
+
+
+def parse_newwest_sessions(page_html, backend=None):
+    """
+    Raw fields of every PerfectMind class container:
+    title, number, spots, onclick, location (None when missing)
+    """
+    return _parser(backend, 1)(page_html)
+
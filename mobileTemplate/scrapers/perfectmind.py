@@ -0,0 +1,91 @@
+# perfectmind.py
+"""
+Concurrent detail-page fetching for PerfectMind (New Westminster) classes.
+
+Each class's landing page holds the ages, adult fee, date and time that the list page
+doesn't show. Instead of opening every page in a browser tab one after another, the pages
+are downloaded over a pooled HTTP session by a bounded worker pool and parsed with BeautifulSoup.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import metrics
+import utils
+
+
+def format_event_date(raw_date):
+    """Turn the page's "29-May-2025" style date into ISO (YYYY-MM-DD)"""
+    date_parts = raw_date.strip().split('-')
+
+    # Format the date in a standard format (Month Day, Year)
+    formatted_date = f"{date_parts[1]} {date_parts[0]}, {date_parts[2]}"
+    return utils.standardize_date(formatted_date, source="newwest")
+
+
+def parse_details_page(html):
+    """
+    Extract (ages, fee, eventDate, eventTime) from a class landing page.
+    Raises ValueError if any field is missing (e.g. the page needs JavaScript to render).
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    age_element = soup.select_one("div.bm-course-restrictions div.row div.second-column")
+
+    # The adult fee is the price tag next to the "Adult" label
+    fee_element = None
+    for label in soup.select("div.bm-course-prices div.row div.first-column"):
+        if 'Adult' in label.get_text():
+            price_column = label.find_next_sibling("div")
+            fee_element = price_column.select_one("div.bm-price-tag") if price_column else None
+            break
+
+    date_span = soup.select_one("span[aria-label*='Event date']")
+    time_span = soup.select_one("span[aria-label*='Event time']")
+
+    if not (age_element and fee_element and date_span and time_span):
+        raise ValueError("details page is missing ages, fee, date or time")
+
+    ages = age_element.get_text(" ", strip=True)
+    fee = fee_element.get_text(" ", strip=True)
+    eventDate = format_event_date(date_span.get_text(strip=True))
+    eventTime = time_span.get_text(" ", strip=True).upper()
+    return ages, fee, eventDate, eventTime
+
+
+@metrics.timer("detail_fetch")
+def fetch_details_page(session, eventLink):
+    response = session.get(eventLink, timeout=15)
+    response.raise_for_status()
+    return parse_details_page(response.text)
+
+
+def fetch_details(links_by_key, session=None, workers=8, on_result=None):
+    """
+    Resolve the detail pages for {key: eventLink} concurrently.
+    Returns {key: (ages, fee, eventDate, eventTime)}; events whose page could not be
+    fetched or parsed are left out so the caller can fall back to the browser for them.
+    `on_result(key, details)` is called for each page as soon as it has been parsed.
+    """
+    if session is None:
+        from http_pool import make_session  # requests is only loaded when something is fetched
+        session = make_session(pool_size=workers)
+
+    def fetch_one(item):
+        key, eventLink = item
+        try:
+            return key, fetch_details_page(session, eventLink)
+        except Exception as e:
+            print(f"Error fetching details for {eventLink}: {e}")
+            metrics.count("detail_fetch_failures")
+            return key, None
+
+    details_by_key = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(fetch_one, item) for item in links_by_key.items()]):
+            key, details = future.result()
+            if details:
+                details_by_key[key] = details
+                if on_result:
+                    on_result(key, details)
+    return details_by_key
@@ -0,0 +1,254 @@
+# query_index.py
+"""
+Companion search index for volleyball_sessions.json, so the app can answer searchEvents,
+getFeaturedItems and getRelatedItems by intersecting sorted integer lists instead of scanning
+every session.
+
+Sessions are identified by their position in volleyball_sessions.json (a "doc id"). The index holds:
+
+    tokens   every lower-cased word of the fields searchEvents matches (title, location, city,
+             category, level, dayOfWeek, ages), in sorted order, each with the sorted doc ids containing it
+    fields   for level, venueType, city, dayOfWeek and status: each distinct value with its doc ids
+    dates    doc ids in start-time order with their start times, plus every distinct day
+             and where its sessions begin in that order
+    featured doc ids and start times, in start-time order, of the sessions getFeaturedItems can show
+             (those with a readable start time)
+
+Each posting list is a slice of one concatenated array, found through an offsets array
+(list i is postings[offsets[i]:offsets[i + 1]]). Two files are written next to the JSON:
+
+    *.index.json  minified JSON, the integer arrays inline under "arrays"
+    *.spki        a binary_file.py container with magic b"SPKI": the arrays as uint8/uint16/uint32
+                  blocks, each described by {"offset", "length", "width"} in the header's "arrays"
+
+Start times are merge.start_epoch values (wall-clock time as UTC); UNKNOWN_START marks
+sessions without a date. Searching matches whole words and word prefixes ("volley"), not
+arbitrary substrings. `QueryIndex` reads the .spki file and is the reference implementation
+of the queries.
+
+Usage: python query_index.py [path/to/volleyball_sessions.json]   (writes both files next to it)
+"""
+import bisect
+import json
+import os
+import re
+import sys
+from datetime import date
+
+import binary_file
+import merge
+import utils
+
+MAGIC = b"SPKI"
+VERSION = 2
+
+TOKEN_FIELDS = ("title", "location", "city", "category", "level", "dayOfWeek", "ages")
+POSTING_FIELDS = ("level", "venueType", "city", "dayOfWeek", "status")
+
+# Start time stored for sessions without a date (merge.UNKNOWN_START doesn't fit in 32 bits)
+UNKNOWN_START = 0xFFFFFFFF
+
+TOKEN_PATTERN = re.compile(r"\w+")
+DATE_PREFIX = re.compile(r"^\d{4}(-\d{1,2}){0,2}-?$")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def _postings(groups):
+    """(offsets, concatenated postings) for a list of sorted doc id lists"""
+    offsets = [0]
+    postings = []
+    for doc_ids in groups:
+        postings.extend(doc_ids)
+        offsets.append(len(postings))
+    return offsets, postings
+
+
+def build_index(events):
+    """The index of a list of events (dicts or Event records) as plain Python lists"""
+    tokens = {}
+    values = {field: {} for field in POSTING_FIELDS}
+    for doc_id, event in enumerate(events):
+        for token in {token for field in TOKEN_FIELDS for token in tokenize(event.get(field))}:
+            tokens.setdefault(token, []).append(doc_id)
+        for field in POSTING_FIELDS:
+            values[field].setdefault(event.get(field) or "", []).append(doc_id)
+
+    terms = sorted(tokens)
+    arrays = {}
+    arrays["tokens.offsets"], arrays["tokens.postings"] = _postings(tokens[term] for term in terms)
+    fields = {}
+    for field in POSTING_FIELDS:
+        fields[field] = sorted(values[field])
+        arrays[f"{field}.offsets"], arrays[f"{field}.postings"] = _postings(values[field][value] for value in fields[field])
+
+    # Date table: doc ids by start time, and where each day's sessions begin
+    starts = [merge.sort_key(event) for event in events]
+    order = sorted(range(len(events)), key=lambda doc_id: (starts[doc_id], doc_id))
+    days = []
+    day_offsets = []
+    for position, doc_id in enumerate(order):
+        day = events[doc_id].get("eventDate") if starts[doc_id] != merge.UNKNOWN_START else None
+        if day and (not days or days[-1] != day):
+            days.append(day)
+            day_offsets.append(position)
+    day_offsets.append(sum(1 for start in starts if start != merge.UNKNOWN_START))
+    arrays["dates.order"] = order
+    arrays["dates.starts"] = [starts[doc_id] if starts[doc_id] != merge.UNKNOWN_START else UNKNOWN_START
+                              for doc_id in order]
+    arrays["dates.offsets"] = day_offsets
+
+    # getFeaturedItems skips sessions whose start time it can't read, so they aren't featured here either
+    timed = [doc_id for doc_id in order if starts[doc_id] != merge.UNKNOWN_START and
+             merge.start_time(events[doc_id].get("eventTime")) is not None]
+    arrays["featured.order"] = timed
+    arrays["featured.starts"] = [starts[doc_id] for doc_id in timed]
+
+    return {"count": len(events), "terms": terms, "fields": fields, "days": days, "arrays": arrays}
+
+
+def write_index_json(index, path):
+    data = json.dumps(index, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    with utils.atomic_open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def write_index_binary(index, path):
+    header = {key: value for key, value in index.items() if key != "arrays"}
+    header["arrays"] = {}
+    blocks = []
+    for name, values in index["arrays"].items():
+        width = binary_file.width(max(values, default=0))
+        header["arrays"][name] = meta = {"length": len(values), "width": width}
+        blocks.append((meta, binary_file.pack_ints(values, width)))
+    return binary_file.write(path, MAGIC, VERSION, header, blocks)
+
+
+def write_index(events, json_path):
+    """Write the .index.json and .spki index of `json_path` (the events it holds) next to it"""
+    base, _ = os.path.splitext(json_path)
+    index = build_index(events)
+    return [write_index_json(index, base + ".index.json"), write_index_binary(index, base + ".spki")]
+
+
+def intersect(lists):
+    """Doc ids present in every sorted list, smallest list first, each lookup a binary search"""
+    lists = sorted(lists, key=len)
+    if not lists:
+        return []
+    result = list(lists[0])
+    for other in lists[1:]:
+        kept = []
+        low = 0
+        for doc_id in result:
+            low = bisect.bisect_left(other, doc_id, low)
+            if low == len(other):
+                break
+            if other[low] == doc_id:
+                kept.append(doc_id)
+        result = kept
+    return result
+
+
+def union(lists):
+    return sorted(set().union(*lists))
+
+
+class QueryIndex(binary_file.BinaryFile):
+    """
+    Memory-mapped reader for .spki files. Queries return doc ids, i.e. positions in
+    volleyball_sessions.json, as lists or arrays that stay usable after close():
+
+        with QueryIndex(path) as index:
+            doc_ids = index.search("drop-in")
+            upcoming = index.featured()
+            related = index.related("Beginner", "Indoor", "Burnaby", exclude=doc_ids[0])
+    """
+
+    def __init__(self, path):
+        super().__init__(path, MAGIC, VERSION, "session index")
+        self.count = self.header["count"]
+        self.terms = self.header["terms"]
+        self.days = self.header["days"]
+        self._arrays = {}
+
+    def array(self, name):
+        """One stored integer array, read from the map on first use"""
+        if name not in self._arrays:
+            meta = self.header["arrays"][name]
+            self._arrays[name] = self.ints(meta["offset"], meta["length"], meta["width"])
+        return self._arrays[name]
+
+    def _posting(self, prefix, i):
+        offsets = self.array(f"{prefix}.offsets")
+        return self.array(f"{prefix}.postings")[offsets[i]:offsets[i + 1]]
+
+    def token(self, prefix):
+        """Doc ids with a word starting with `prefix`"""
+        first = bisect.bisect_left(self.terms, prefix)
+        last = bisect.bisect_left(self.terms, prefix + "\uffff", first)
+        if last - first == 1:
+            return self._posting("tokens", first)
+        return union(self._posting("tokens", i) for i in range(first, last))
+
+    def field(self, field, value):
+        """Doc ids whose `field` is exactly `value`"""
+        values = self.header["fields"][field]
+        i = bisect.bisect_left(values, value)
+        if i == len(values) or values[i] != value:
+            return []
+        return self._posting(field, i)
+
+    def on_days(self, prefix):
+        """Doc ids, in start-time order, of sessions on days whose ISO date starts with `prefix`"""
+        first = bisect.bisect_left(self.days, prefix)
+        last = bisect.bisect_left(self.days, prefix + "\uffff", first)
+        if first == last:
+            return []
+        offsets = self.array("dates.offsets")
+        return self.array("dates.order")[offsets[first]:offsets[last]]
+
+    def search(self, query, today=None):
+        """searchEvents: "today", an ISO date prefix ("2025-05"), or words / word prefixes that must all match"""
+        query = query.strip().lower()
+        if query == "today":
+            return sorted(self.on_days((today or date.today()).isoformat()))
+        if DATE_PREFIX.match(query):
+            return sorted(self.on_days(query))
+        words = tokenize(query)
+        if not words:
+            return list(range(self.count))
+        return intersect([self.token(word) for word in words])
+
+    def filter(self, **values):
+        """Doc ids matching every field=value given (level, venueType, city, dayOfWeek, status)"""
+        return intersect([self.field(field, value) for field, value in values.items()])
+
+    def featured(self, limit=5, now=None):
+        """getFeaturedItems: the next `limit` sessions starting from now, soonest first"""
+        starts = self.array("featured.starts")
+        first = bisect.bisect_left(starts, merge.wall_clock_epoch(now))
+        return list(self.array("featured.order")[first:first + limit])
+
+    def related(self, level, venueType, city, exclude=None, limit=3):
+        """getRelatedItems: up to `limit` other sessions with the same level, venue type and city"""
+        doc_ids = self.filter(level=level, venueType=venueType, city=city)
+        return [doc_id for doc_id in doc_ids if doc_id != exclude][:limit]
+
+
+def main():
+    json_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "assets", "data", "volleyball_sessions.json")
+    with open(json_path) as f:
+        events = json.load(f)
+
+    print(f"{json_path}: {len(events)} sessions, {os.path.getsize(json_path) / 1024:.1f} KB")
+    for path in write_index(events, json_path):
+        print(f"{path}: {os.path.getsize(path) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# readiness.py
+"""
+Event-driven page readiness checks for the Selenium scrapers.
+
+Instead of sleeping a fixed amount after every interaction, these helpers poll the page
+(through WebDriverWait) until it has actually settled: the number of cards stops changing,
+a piece of text stops changing, or the page has no fetch / XHR requests in flight.
+Each step has its own timeout, and how long every wait really took is recorded so we
+can see where scrape latency goes.
+"""
+import time
+
+import metrics
+
+POLL_INTERVAL = 0.1
+
+# Installs (once per document) a counter that goes up when fetch / XMLHttpRequest starts a
+# request and down when it settles, then returns
+# [document.readyState, requests in flight, jQuery.active, finished resource entries].
+# Requests started before the counter is installed aren't seen, hence track_requests().
+NETWORK_ACTIVITY_JS = """
+if (window.__spikePending === undefined) {
+    window.__spikePending = 0;
+    const done = () => { window.__spikePending = Math.max(0, window.__spikePending - 1); };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            window.__spikePending++;
+            try {
+                const result = fetch.apply(this, arguments);
+                result.then(done, done);
+                return result;
+            } catch (e) {
+                done();
+                throw e;
+            }
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__spikePending++;
+        this.addEventListener('loadend', done, {once: true});
+        try {
+            return send.apply(this, arguments);
+        } catch (e) {
+            done();
+            throw e;
+        }
+    };
+}
+const jqueryActive = window.jQuery ? window.jQuery.active : 0;
+return [document.readyState, window.__spikePending, jqueryActive,
+        performance.getEntriesByType('resource').length];
+"""
+
+# How long the page has to stay quiet after a scroll before we decide nothing more is coming.
+# The scroll handler may only start its request after a moment, so this is the 1.5s the
+# scraper used to sleep, not a network round trip.
+SCROLL_SETTLE = 1.5
+
+
+class WaitRecorder:
+    """Collects (step, seconds, timed_out) for every wait in a run"""
+
+    def __init__(self):
+        self.waits = []
+
+    def record(self, step, seconds, timed_out=False):
+        self.waits.append((step, seconds, timed_out))
+        metrics.observe("wait", seconds, step=step)
+        if timed_out:
+            metrics.count("wait_timeouts", step=step)
+
+    def total(self):
+        return sum(seconds for _, seconds, _ in self.waits)
+
+    def summary(self):
+        lines = [f"  {step}: {seconds:.2f}s{' (timed out)' if timed_out else ''}"
+                 for step, seconds, timed_out in self.waits]
+        return "\n".join([f"Waited {self.total():.2f}s in {len(self.waits)} steps:"] + lines)
+
+    def reset(self):
+        self.waits = []
+
+
+# Shared by both scrapers; print `recorder.summary()` at the end of a run
+recorder = WaitRecorder()
+
+
+class _Stable:
+    """WebDriverWait condition: true once `probe(driver)` returns the same value for `settle` seconds"""
+
+    def __init__(self, probe, settle, accept=None):
+        self.probe = probe
+        self.settle = settle
+        self.accept = accept or (lambda value: True)
+        self.value = None
+        self.since = None
+
+    def __call__(self, driver):
+        value = self.probe(driver)
+        now = time.monotonic()
+        if value != self.value:
+            self.value, self.since = value, now
+            return False
+        return self.accept(value) and now - self.since >= self.settle
+
+
+def _wait(driver, condition, step, timeout, required):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    start = time.monotonic()
+    timed_out = False
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+    except TimeoutException:
+        timed_out = True
+        if required:
+            raise
+    finally:
+        recorder.record(step, time.monotonic() - start, timed_out)
+    return not timed_out
+
+
+def wait_for_stable_count(driver, css_selector, step, timeout=10, settle=0.5, minimum=0, required=False):
+    """Wait until the number of elements matching `css_selector` (at least `minimum`) stops changing"""
+    condition = _Stable(
+        lambda d: d.execute_script("return document.querySelectorAll(arguments[0]).length;", css_selector),
+        settle,
+        accept=lambda count: count >= minimum,
+    )
+    _wait(driver, condition, step, timeout, required)
+    return condition.value or 0
+
+
+def wait_for_stable_text(driver, css_selector, step, timeout=5, settle=0.3, changed_from=None, required=False):
+    """Wait until an element's text settles (and differs from `changed_from`, if given)"""
+    condition = _Stable(
+        lambda d: d.execute_script(
+            "const el = document.querySelector(arguments[0]); return el ? el.textContent.trim() : null;",
+            css_selector),
+        settle,
+        accept=lambda text: text is not None and text != changed_from,
+    )
+    _wait(driver, condition, step, timeout, required)
+    return condition.value
+
+
+def track_requests(driver):
+    """Start counting the page's fetch / XHR requests; call it right after loading the page"""
+    driver.execute_script(NETWORK_ACTIVITY_JS)
+
+
+def _network_idle(idle):
+    """Condition: document loaded and no fetch / XHR / jQuery request in flight for `idle` seconds"""
+    return _Stable(
+        lambda d: d.execute_script(NETWORK_ACTIVITY_JS),
+        idle,
+        accept=lambda state: state[0] == "complete" and state[1] == 0 and state[2] == 0,
+    )
+
+
+def wait_for_network_idle(driver, step, timeout=10, idle=0.5, required=False):
+    """Wait until the document is loaded and no requests have been in flight for `idle` seconds"""
+    return _wait(driver, _network_idle(idle), step, timeout, required)
+
+
+def wait_for_more(driver, css_selector, previous_count, step, timeout=8, idle=SCROLL_SETTLE):
+    """
+    After triggering a lazy load (e.g. scrolling), wait until more elements match `css_selector`.
+    Returns the new count, or `previous_count` once no request has been in flight for `idle`
+    seconds without new elements showing up.
+    """
+    grown = lambda d: d.execute_script(
+        "return document.querySelectorAll(arguments[0]).length;", css_selector) > previous_count
+    idle_check = _network_idle(idle)
+
+    _wait(driver, lambda d: grown(d) or idle_check(d), step, timeout, required=False)
+    return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", css_selector)
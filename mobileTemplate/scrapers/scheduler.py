@@ -0,0 +1,312 @@
+# scheduler.py
+"""
+Long-running refresh service: scrapes each city on its own adaptive intervals instead of all
+cities every 20 minutes.
+
+Cities whose scraper takes a date range (WINDOWED_CITIES) get two jobs, each with its own state:
+
+    <city>:near   the next 48 hours, merged into the saved sessions (mostly `openings` changes)
+    <city>:far    the scraper's whole default range, replacing the saved sessions as a full run does
+
+Other cities are refreshed by a single job named after the city.
+
+After every run the delta (see event_cache.record_run) is turned into change rates, changes per
+hour to sessions starting within / after the next 48 hours, kept as moving averages. A job's
+interval aims for about TARGET_CHANGES weighted changes per run, counting only its own window
+(WINDOW_WEIGHTS; near-term changes weigh more): busy windows are polled down to --min-interval,
+stable ones back off to --max-interval. Failed runs retry with exponential backoff.
+
+Due jobs run earliest-deadline-first in a process pool (the orchestrator's workers, so warm
+Chrome instances are reused), never two of the same city at once, under two global budgets:
+  --workers      at most this many scrapes at once
+  --cpu-budget   scrape time summed over all workers may use at most this share of each
+                 rolling hour (a job's wall time stands in for its CPU cost; Chrome does the
+                 work in child processes), and no new job starts while the load average per
+                 core is above --max-load
+
+The learned intervals are kept in cache/scheduler-state.json, so a restart doesn't start over.
+
+Usage: python scheduler.py [--workers 2] [--cities burnaby newwest] [--cpu-budget 0.15]
+"""
+import argparse
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import event_cache
+import merge
+import metrics
+import orchestrator
+import utils
+
+STATE_FILE = os.path.join(event_cache.CACHE_DIR, "scheduler-state.json")
+
+DEFAULT_INTERVAL = 1200  # first run of a job, same as the old fixed loop
+MIN_INTERVAL = 300
+MAX_INTERVAL = 2 * 60 * 60
+
+NEAR_TERM = 48 * 60 * 60
+NEAR_TERM_WEIGHT = 3.0  # a near-term change counts as this many far-future changes
+
+# Scrapers that can refresh a date range on its own. Burnaby's activity search returns every
+# session in a few HTTP pages and has no date filter, so splitting it would save nothing.
+WINDOWED_CITIES = ("newwest",)
+
+# Window -> (weight of near-term changes, weight of far-future changes) in its interval
+WINDOW_WEIGHTS = {
+    "near": (NEAR_TERM_WEIGHT, 0.0),
+    "far": (0.0, 1.0),
+    "all": (NEAR_TERM_WEIGHT, 1.0),
+}
+TARGET_CHANGES = 2.0  # weighted changes per run the interval aims for
+SMOOTHING = 0.5  # weight of the newest rate in the moving average
+MAX_STEP = 2.0  # an interval changes by at most this factor per run
+
+DEFAULT_CPU_BUDGET = 0.15
+DEFAULT_MAX_LOAD = 0.9
+BUDGET_WINDOW = 60 * 60
+MAX_SLEEP = 60
+
+
+def count_changes(delta, now=None):
+    """(near-term, far-future) number of changed sessions in a delta"""
+    clock = merge.wall_clock_epoch(now)
+    near = far = 0
+    for kind in ("added", "changed", "removed"):
+        for entry in delta.get(kind, []):
+            event = entry["event"] if kind == "changed" else entry
+            start = merge.sort_key(event)
+            if kind == "removed" and start < clock:
+                continue  # a session that already happened dropped off the list; not a change
+            if start - clock < NEAR_TERM:
+                near += 1
+            else:
+                far += 1
+    return near, far
+
+
+def jobs_for(cities):
+    """Job names: "<city>:near" and "<city>:far" for windowed cities, the city itself otherwise"""
+    jobs = []
+    for city in cities:
+        jobs += [f"{city}:near", f"{city}:far"] if city in WINDOWED_CITIES else [city]
+    return jobs
+
+
+def job_city(job):
+    return job.partition(":")[0]
+
+
+def job_window(job):
+    return job.partition(":")[2] or "all"
+
+
+def job_options(job, now):
+    """scrape_volleyball_events arguments for a job started at `now`"""
+    if job_window(job) != "near":
+        return {}
+    return {"start": datetime.fromtimestamp(now).date(), "end": datetime.fromtimestamp(now + NEAR_TERM).date(),
+            "partial": True}
+
+
+class SourceState:
+    """Learned refresh rate of one job"""
+
+    def __init__(self, job, interval=DEFAULT_INTERVAL, near_rate=None, far_rate=None,
+                 last_run=None, next_run=0.0, failures=0):
+        self.job = job
+        self.interval = interval
+        self.near_rate = near_rate  # near-term changes per hour
+        self.far_rate = far_rate
+        self.last_run = last_run  # end of the last successful run
+        self.next_run = next_run
+        self.failures = failures
+
+    def to_dict(self):
+        return {"interval": self.interval, "near_rate": self.near_rate, "far_rate": self.far_rate,
+                "last_run": self.last_run, "next_run": self.next_run, "failures": self.failures}
+
+    def succeeded(self, delta, now, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        near, far = count_changes(delta, now)
+        if self.last_run is not None:
+            hours = max(now - self.last_run, 1.0) / 3600
+            self.near_rate = smooth(self.near_rate, near / hours)
+            self.far_rate = smooth(self.far_rate, far / hours)
+            near_weight, far_weight = WINDOW_WEIGHTS[job_window(self.job)]
+            weighted = near_weight * self.near_rate + far_weight * self.far_rate
+            target = TARGET_CHANGES / weighted * 3600 if weighted else max_interval
+            target = min(max(target, self.interval / MAX_STEP), self.interval * MAX_STEP)
+            self.interval = min(max(target, min_interval), max_interval)
+        # Without a previous run the delta covers an unknown time span, so it doesn't set a rate
+        self.interval = min(max(self.interval, min_interval), max_interval)
+
+        self.last_run = now
+        self.next_run = now + self.interval
+        self.failures = 0
+        return near, far
+
+    def failed(self, now, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        self.failures += 1
+        self.next_run = now + min(min_interval * 2 ** (self.failures - 1), max_interval)
+
+
+def smooth(average, value):
+    return value if average is None else SMOOTHING * value + (1 - SMOOTHING) * average
+
+
+def load_state(jobs, path=STATE_FILE):
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    if not isinstance(saved, dict):
+        saved = {}
+
+    # Keys an older or newer version saved are ignored instead of failing the scheduler's startup
+    fields = SourceState(None).to_dict().keys()
+    states = {}
+    for job in jobs:
+        entry = saved.get(job)
+        if not isinstance(entry, dict):
+            entry = {}
+        states[job] = SourceState(job, **{key: value for key, value in entry.items() if key in fields})
+    return states
+
+
+def save_state(states, path=STATE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with utils.atomic_open(path) as f:
+        json.dump({job: state.to_dict() for job, state in states.items()}, f, indent=4)
+
+
+def load_delta(city):
+    try:
+        with open(os.path.join(event_cache.CACHE_DIR, f"{city}-drop-in-delta.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class CPUBudget:
+    """Scrape seconds used over a rolling window, plus a load-average guard"""
+
+    def __init__(self, fraction=DEFAULT_CPU_BUDGET, max_load=DEFAULT_MAX_LOAD, window=BUDGET_WINDOW):
+        self.limit = fraction * window
+        self.max_load = max_load
+        self.window = window
+        self.history = deque()  # (finished at, seconds)
+
+    def record(self, now, seconds):
+        self.history.append((now, seconds))
+
+    def used(self, now):
+        while self.history and now - self.history[0][0] > self.window:
+            self.history.popleft()
+        return sum(seconds for _, seconds in self.history)
+
+    def overloaded(self):
+        if not hasattr(os, "getloadavg"):
+            return False
+        return os.getloadavg()[0] / (os.cpu_count() or 1) > self.max_load
+
+    def allows(self, now):
+        return self.used(now) < self.limit and not self.overloaded()
+
+
+def due_jobs(states, busy, now):
+    """Jobs whose refresh is due and whose city isn't being scraped, most overdue first"""
+    due = [state for job, state in states.items() if job_city(job) not in busy and state.next_run <= now]
+    return [state.job for state in sorted(due, key=lambda state: state.next_run)]
+
+
+def busy_cities(running):
+    return {job_city(job) for job, _ in running.values()}
+
+
+def finish_job(state, future, budget, started, min_interval, max_interval):
+    now = time.time()
+    seconds = now - started
+    budget.record(now, seconds)
+    try:
+        _, events, _ = future.result()
+    except Exception as e:
+        metrics.log("job_failed", level="error", job=state.job, error=repr(e))
+        events = None
+
+    if events is None:
+        state.failed(now, min_interval, max_interval)
+        metrics.log("job_finished", job=state.job, ok=False, seconds=round(seconds, 1),
+                    failures=state.failures, next_in=round(state.next_run - now))
+        return False
+
+    near, far = state.succeeded(load_delta(job_city(state.job)), now, min_interval, max_interval)
+    metrics.log("job_finished", job=state.job, ok=True, seconds=round(seconds, 1), events=len(events),
+                near_changes=near, far_changes=far, interval=round(state.interval), next_in=round(state.interval))
+    return True
+
+
+def run(cities=None, workers=2, cpu_budget=DEFAULT_CPU_BUDGET, max_load=DEFAULT_MAX_LOAD,
+        min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+    states = load_state(jobs_for(cities or list(orchestrator.SOURCES)))
+    budget = CPUBudget(cpu_budget, max_load)
+    running = {}  # future -> (job, started)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=orchestrator.init_worker) as pool:
+        while True:
+            now = time.time()
+            for job in due_jobs(states, busy_cities(running), now):
+                if len(running) >= workers or not budget.allows(now):
+                    break
+                if job_city(job) in busy_cities(running):
+                    continue  # the other window of a city that was just started
+                overdue = now - states[job].next_run if states[job].next_run else 0
+                metrics.log("job_started", job=job, overdue=round(overdue))
+                running[pool.submit(orchestrator.run_city, job_city(job), **job_options(job, now))] = (job, now)
+
+            # Sleep until a job finishes or the next job is due; re-check the budget every MAX_SLEEP
+            busy = busy_cities(running)
+            wake = min((state.next_run for job, state in states.items() if job_city(job) not in busy),
+                       default=now + MAX_SLEEP)
+            if not budget.allows(now):
+                wake = now + MAX_SLEEP
+            timeout = min(max(wake - now, 1), MAX_SLEEP)
+
+            if not running:
+                time.sleep(timeout)
+                continue
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            changed = False
+            for future in done:
+                job, started = running.pop(future)
+                changed |= finish_job(states[job], future, budget, started, min_interval, max_interval)
+            if done:
+                save_state(states)
+            if changed:
+                try:
+                    merge.merge_files()
+                except Exception as e:  # keep serving; the next successful job merges again
+                    metrics.log("merge_failed", level="error", error=repr(e))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh each city on its own adaptive intervals.")
+    parser.add_argument("--workers", type=int, default=2, help="max scrapers running at once")
+    parser.add_argument("--cities", nargs="+", choices=sorted(orchestrator.SOURCES), help="only schedule these cities")
+    parser.add_argument("--cpu-budget", type=float, default=DEFAULT_CPU_BUDGET,
+                        help="share of each hour that scrapes may run, summed over workers")
+    parser.add_argument("--max-load", type=float, default=DEFAULT_MAX_LOAD,
+                        help="don't start a scrape while the load average per core is above this")
+    parser.add_argument("--min-interval", type=int, default=MIN_INTERVAL, help="fastest refresh, in seconds")
+    parser.add_argument("--max-interval", type=int, default=MAX_INTERVAL, help="slowest refresh, in seconds")
+    args = parser.parse_args()
+
+    run(args.cities, args.workers, args.cpu_budget, args.max_load, args.min_interval, args.max_interval)
+
+
+if __name__ == "__main__":
+    main()
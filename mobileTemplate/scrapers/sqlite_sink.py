@@ -0,0 +1,236 @@
+# sqlite_sink.py
+"""
+Write scraped events straight into a SQLite database using assets/data/databaseStructure.txt,
+so the app can ship (or download) a prebuilt volleyball.db instead of replaying per-row inserts.
+
+- WAL journal, one transaction per run, holding the write lock from the schema check on so
+  both city scrapers can save at once
+- lookup-table IDs (venues, levels, categories) loaded once and cached, new names inserted on demand
+- sessions upserted with executemany, keyed on a unique `occurrence_key` column
+- sessions gain a `city` column, indexed together with event_date and level
+
+event_id holds the scraped eventID, as it does when the app inserts sessions itself. New
+Westminster lists every occurrence of a class under the same eventID, so the schema's UNIQUE on
+event_id is dropped and rows are keyed on occurrence_key instead: the occurrence identity used
+everywhere else (event_cache.event_key: the occurrence's link, else eventID).
+
+Usage: python sqlite_sink.py [--db PATH]   (loads the current *-drop-in-sessions.json files)
+"""
+import argparse
+import os
+import re
+import sqlite3
+
+import event_cache
+import metrics
+import utils
+
+SCHEMA_FILE = os.path.join(utils.DATA_DIR, "databaseStructure.txt")
+DB_FILE = os.path.join(utils.DATA_DIR, "volleyball.db")
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_sessions_event_date ON sessions (event_date);",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_level ON sessions (level_id);",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_city ON sessions (city);",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_occurrence ON sessions (occurrence_key);",
+)
+
+UNIQUE_EVENT_ID = re.compile(r"\bevent_id\s+TEXT\s+UNIQUE\b", re.IGNORECASE)
+
+# The schema's CHECK constraints; anything else is stored as NULL
+VENUE_TYPES = ("Indoor", "Grass", "Beach")
+STATUSES = ("Open", "Full", "Cancelled", "Register Soon")
+
+UPSERT_SESSION = """
+    INSERT INTO sessions (
+        occurrence_key, event_id, title, location_id, city, event_link, category_id, level_id,
+        ages, openings, status, event_date, event_time, fee
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (occurrence_key) DO UPDATE SET
+        event_id = excluded.event_id,
+        title = excluded.title,
+        location_id = excluded.location_id,
+        city = excluded.city,
+        event_link = excluded.event_link,
+        category_id = excluded.category_id,
+        level_id = excluded.level_id,
+        ages = excluded.ages,
+        openings = excluded.openings,
+        status = excluded.status,
+        event_date = excluded.event_date,
+        event_time = excluded.event_time,
+        fee = excluded.fee;
+"""
+
+
+def connect(db_path=None):
+    conn = sqlite3.connect(db_path or DB_FILE, timeout=30)  # both city scrapers may write at once
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA foreign_keys=ON;")
+    return conn
+
+
+def ensure_schema(conn, schema_file=SCHEMA_FILE):
+    """
+    Open a write transaction (BEGIN IMMEDIATE) and create what's missing inside it. The
+    transaction is left open for the caller, so a concurrent writer waits until it commits
+    instead of racing it on the `city` column or on new lookup names.
+    """
+    with open(schema_file) as f:
+        conn.executescript("BEGIN IMMEDIATE;\n" + f.read())
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions);")}
+    if "city" not in columns:
+        conn.execute("ALTER TABLE sessions ADD COLUMN city TEXT;")
+    if "occurrence_key" not in columns:
+        conn.execute("ALTER TABLE sessions ADD COLUMN occurrence_key TEXT;")
+        # Existing rows were keyed on event_id (this sink used to store the occurrence there)
+        conn.execute("UPDATE sessions SET occurrence_key = event_id;")
+    _drop_unique_event_id(conn)
+    for statement in INDEXES:
+        conn.execute(statement)
+
+
+def _drop_unique_event_id(conn):
+    """
+    Rebuild sessions without the UNIQUE on event_id (SQLite can't drop a constraint in place),
+    keeping every row and its id so user_registrations still point at the right sessions.
+    """
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'sessions';").fetchone()[0]
+    if not UNIQUE_EVENT_ID.search(sql):
+        return
+
+    columns = ", ".join(row[1] for row in conn.execute("PRAGMA table_info(sessions);"))
+    conn.execute("CREATE TEMP TABLE sessions_copy AS SELECT * FROM sessions;")
+    # Registrations reference sessions by id; check them once the rows are back
+    conn.execute("PRAGMA defer_foreign_keys=ON;")
+    conn.execute("DROP TABLE sessions;")
+    conn.execute(UNIQUE_EVENT_ID.sub("event_id TEXT", sql))
+    conn.execute(f"INSERT INTO sessions ({columns}) SELECT {columns} FROM temp.sessions_copy;")
+    conn.execute("DROP TABLE temp.sessions_copy;")
+
+
+class LookupCache:
+    """name -> id for one lookup table, inserting names it hasn't seen (load it inside ensure_schema's transaction)"""
+
+    def __init__(self, conn, table, extra_column=None):
+        self.conn = conn
+        self.table = table
+        self.extra_column = extra_column
+        self.ids = {name: row_id for row_id, name in conn.execute(f"SELECT id, name FROM {table};")}
+
+    def get(self, name, extra=None):
+        row_id = self.ids.get(name)
+        if row_id is None:
+            if self.extra_column:
+                cursor = self.conn.execute(
+                    f"INSERT INTO {self.table} (name, {self.extra_column}) VALUES (?, ?);", (name, extra))
+            else:
+                cursor = self.conn.execute(f"INSERT INTO {self.table} (name) VALUES (?);", (name,))
+            row_id = self.ids[name] = cursor.lastrowid
+        return row_id
+
+
+def parse_openings(openings):
+    """"12" -> 12, "Full" -> 0, anything else (e.g. "Unspecified") -> None"""
+    openings = (openings or "").strip()
+    if openings.isdigit():
+        return int(openings)
+    return 0 if openings.lower() == "full" else None
+
+
+def session_rows(events, venues, levels, categories):
+    for event in events:
+        venue_type = event.get("venueType")
+        status = event.get("status")
+        yield (
+            event_cache.event_key(event),
+            event.get("eventID"),
+            event["title"],
+            venues.get(event["location"], venue_type if venue_type in VENUE_TYPES else None),
+            event.get("city"),
+            event.get("eventLink"),
+            categories.get(event["category"]),
+            levels.get(event["level"]),
+            event.get("ages"),
+            parse_openings(event.get("openings")),
+            status if status in STATUSES else None,
+            event.get("eventDate"),
+            event.get("eventTime"),
+            event.get("fee"),
+        )
+
+
+def save_to_sqlite(events, city=None, db_path=None):
+    """
+    Upsert a run's events in a single transaction. With `city`, that city's sessions that
+    are no longer listed (and have no registrations) are removed, mirroring the JSON file.
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            ensure_schema(conn)
+            venues = LookupCache(conn, "venues", "venue_type")
+            levels = LookupCache(conn, "levels")
+            categories = LookupCache(conn, "categories")
+            conn.executemany(UPSERT_SESSION, session_rows(events, venues, levels, categories))
+
+            if city is not None:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS run_occurrences (occurrence_key TEXT PRIMARY KEY);")
+                conn.execute("DELETE FROM run_occurrences;")
+                conn.executemany("INSERT OR IGNORE INTO run_occurrences VALUES (?);",
+                                 ((event_cache.event_key(event),) for event in events))
+                conn.execute("""
+                    DELETE FROM sessions
+                    WHERE city = ?
+                      AND occurrence_key NOT IN (SELECT occurrence_key FROM run_occurrences)
+                      AND id NOT IN (SELECT session_id FROM user_registrations);
+                """, (event_city(events, city),))
+
+        # Fold the WAL back into the main file so the .db can be copied on its own
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    finally:
+        conn.close()
+
+    print(f"Upserted {len(events)} sessions into {db_path or DB_FILE}")
+
+
+def try_save_to_sqlite(events, city):
+    """
+    save_to_sqlite as a best-effort step after a scrape: the JSON file is what the run is judged
+    by and has already been written, so a database error (a lock timeout, a missing schema file)
+    is logged and counted instead of failing the scrape. The next run's upsert catches up.
+    """
+    try:
+        with metrics.timer("sqlite", source=city):
+            save_to_sqlite(events, city)
+        return True
+    except (sqlite3.Error, OSError) as e:
+        print(f"{city}: could not update the SQLite database: {e}")
+        metrics.log("sqlite_failed", level="error", source=city, error=repr(e))
+        metrics.count("sqlite_failures", source=city)
+        return False
+
+
+def event_city(events, city):
+    """The display city name stored on the rows (e.g. "burnaby" -> "Burnaby")"""
+    for event in events:
+        if event.get("city"):
+            return event["city"]
+    return city
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the scraped sessions into SQLite.")
+    parser.add_argument("--db", default=DB_FILE, help=f"database file (default: {DB_FILE})")
+    args = parser.parse_args()
+
+    for city in ("burnaby", "newwest"):
+        events = utils.load_from_json(city)
+        if events:
+            save_to_sqlite(events, city, args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# conftest.py
+"""The scrapers import each other as top-level modules (they run from this directory)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,24 @@
+# test_activecommunities.py
+import activecommunities
+
+
+def test_fixture_pages_parse_into_every_session():
+    events = activecommunities.fetch_volleyball_events(fixture_dir=activecommunities.FIXTURE_DIR)
+    assert len(events) == 92
+    assert all(event["city"] == "Burnaby" and event["eventLink"] for event in events)
+    assert {event["dayOfWeek"] for event in events} <= {
+        "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"}
+
+
+def test_null_fields_fall_back_instead_of_crashing():
+    page = {"headers": {"page_info": None}, "body": {"activity_items": [
+        {"name": None, "action_link": None, "detail_url": None},
+        {"name": "Volleyball Adult", "number": None, "detail_url": None, "location": None,
+         "action_link": {"href": "https://example.com/61200"}, "ages": None, "openings": None,
+         "date_range_start": None, "date_range": None, "time_range": None},
+    ]}}
+    assert activecommunities.total_pages(page) == 1
+    [event] = activecommunities.parse_page(page)
+    assert (event["title"], event["eventID"], event["eventLink"]) == ("Volleyball Adult", "", "https://example.com/61200")
+    assert (event["location"], event["ages"], event["openings"]) == ("No location", "No age group", "Full")
+    assert (event["eventDate"], event["eventTime"]) == ("No date", "NO TIME RANGE")
@@ -0,0 +1,26 @@
+# test_columnar.py
+import columnar
+from event_record import FIELDS
+
+
+def make_event(i, **fields):
+    event = {field: f"{field} {i}" for field in FIELDS}
+    event.update(city="Burnaby", level="Intermediate")
+    event.update(fields)
+    return event
+
+
+def test_binary_round_trip_keeps_none(tmp_path):
+    events = [make_event(0), make_event(1, title=None, eventTime=None), make_event(2, title="")]
+    path = columnar.write_binary(events, str(tmp_path / "sessions.spkc"))
+    with columnar.ColumnarFile(path) as sessions:
+        assert sessions.rows() == events
+        assert sessions.column("title") == ["title 0", None, ""]
+
+
+def test_results_outlive_close(tmp_path):
+    path = columnar.write_binary([make_event(i) for i in range(3)], str(tmp_path / "sessions.spkc"))
+    sessions = columnar.ColumnarFile(path)
+    codes, dictionary = sessions.codes("city")
+    sessions.close()
+    assert [dictionary[code] for code in codes] == ["Burnaby"] * 3
@@ -0,0 +1,73 @@
+# test_driver_pool.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import driver_pool
+
+
+class FakeDriver:
+    def __init__(self, options=None):
+        self.driver = self
+        self.uses = 0
+        self.baseline_rss = 0
+        self.healthy = True
+
+    def rss(self):
+        return 0
+
+    def is_healthy(self):
+        return self.healthy
+
+    def reset(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def fake_drivers(monkeypatch):
+    monkeypatch.setattr(driver_pool, "PooledDriver", FakeDriver)
+
+
+def test_waiter_gets_a_replacement_for_a_recycled_driver(fake_drivers):
+    pool = driver_pool.DriverPool(size=1, max_uses=1)
+    leased = threading.Event()
+    release = threading.Event()
+
+    def first():
+        with pool.lease():
+            leased.set()
+            release.wait(5)
+
+    def second():
+        leased.wait(5)
+        with pool.lease(timeout=5) as driver:
+            return driver
+
+    with ThreadPoolExecutor(2) as executor:
+        holder = executor.submit(first)
+        waiter = executor.submit(second)
+        leased.wait(5)
+        release.set()
+        holder.result()
+        assert waiter.result() is not None
+
+
+def test_dead_idle_driver_is_replaced(fake_drivers):
+    pool = driver_pool.DriverPool(size=1)
+    with pool.lease() as driver:
+        first = driver
+    first.healthy = False
+    with pool.lease(timeout=1) as driver:
+        assert driver is not first and driver.is_healthy()
+
+
+def test_lease_times_out_when_every_driver_is_busy(fake_drivers):
+    pool = driver_pool.DriverPool(size=1)
+    with pool.lease():
+        with pytest.raises(TimeoutError):
+            with pool.lease(timeout=0.1):
+                pass
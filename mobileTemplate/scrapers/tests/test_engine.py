@@ -0,0 +1,77 @@
+# test_engine.py
+import asyncio
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+import activecommunities
+import engine
+
+
+class BrokenNormalizeSource(engine.BurnabySource):
+    def normalize(self, events):
+        raise ValueError("bad event")
+
+
+def run(source, timeout=30):
+    scraper = engine.Engine([source])
+    try:
+        return asyncio.run(asyncio.wait_for(scraper.run(), timeout))
+    finally:
+        scraper.close()
+
+
+def test_fixture_run_collects_events():
+    results = run(engine.BurnabySource(activecommunities.FIXTURE_DIR))
+    assert results["burnaby"]
+
+
+def test_failing_normalize_ends_the_run():
+    results = run(BrokenNormalizeSource(activecommunities.FIXTURE_DIR))
+    assert results == {"burnaby": []}
+
+
+def run_engine(source):
+    scraper = engine.Engine([source], retries=0)
+    try:
+        results = asyncio.run(asyncio.wait_for(scraper.run(), 30))
+    finally:
+        scraper.close()
+    return results, scraper.incomplete
+
+
+def without_page_3(tmp_path):
+    fixture_dir = tmp_path / "saved pages"  # the space has to survive the file:// URL
+    fixture_dir.mkdir()
+    for page in (1, 2, 4, 5):
+        shutil.copy(activecommunities.fixture_path(activecommunities.FIXTURE_DIR, page), fixture_dir)
+    return str(fixture_dir)
+
+
+def test_missing_page_falls_back_to_the_card_list(tmp_path):
+    source = engine.BurnabySource(without_page_3(tmp_path))
+    list_page = Path(activecommunities.FIXTURE_DIR, "list.html").resolve().as_uri()
+    source.browser_request = lambda: engine.Request(list_page, meta={"kind": "browser"})
+    results, incomplete = run_engine(source)
+    assert not incomplete
+    assert len(results["burnaby"]) == 92
+
+
+def test_failed_fallback_leaves_the_source_incomplete(tmp_path, monkeypatch):
+    def no_browser():
+        raise RuntimeError("no browser here")
+    monkeypatch.setattr(engine.driver_pool, "lease", no_browser)
+    results, incomplete = run_engine(engine.BurnabySource(without_page_3(tmp_path)))
+    assert incomplete == {"burnaby"}
+
+
+def test_every_shard_failing_fails_the_source(monkeypatch):
+    source = engine.NewWestSource(date(2026, 1, 1), date(2026, 1, 31), shard_size="week")
+    monkeypatch.setattr(source.scraper, "previous_events", lambda start, end: [])
+    requests = source.start_requests()
+    for request in requests[:-1]:
+        assert source.failed(request, TimeoutError()) == []
+    with pytest.raises(RuntimeError):
+        source.failed(requests[-1], TimeoutError())
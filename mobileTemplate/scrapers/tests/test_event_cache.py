@@ -0,0 +1,50 @@
+# test_event_cache.py
+import json
+
+import event_cache
+import utils
+
+
+def occurrence(day, openings="4", **fields):
+    event = {"eventID": "12345", "title": "Drop-in Volleyball", "location": "Queensborough",
+             "eventLink": f"https://example.com/class?occurrenceDate={day.replace('-', '')}",
+             "ages": "19+", "fee": "$5.00", "eventDate": day, "eventTime": "7:00 PM - 9:00 PM",
+             "openings": openings}
+    event.update(fields)
+    return event
+
+
+def test_cache_hits_are_per_occurrence(tmp_path):
+    cache = event_cache.EventCache("newwest", cache_dir=str(tmp_path))
+    monday = occurrence("2099-05-04")
+    cache.put(monday)
+    cache.save()
+
+    cache = event_cache.EventCache("newwest", cache_dir=str(tmp_path))
+    assert cache.get(event_cache.event_key(monday))["eventDate"] == "2099-05-04"
+    # Same eventID, different occurrence: a miss
+    assert cache.get(event_cache.event_key(occurrence("2099-05-05"))) is None
+
+
+def test_records_with_unknown_details_are_not_cached(tmp_path):
+    cache = event_cache.EventCache("newwest", cache_dir=str(tmp_path))
+    cache.put(occurrence("2099-05-04", fee="Unknown"))
+    assert len(cache) == 0
+
+
+def test_delta_between_two_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "DATA_DIR", str(tmp_path))
+    monday, tuesday, wednesday = occurrence("2099-05-04"), occurrence("2099-05-05"), occurrence("2099-05-06")
+
+    cache = event_cache.EventCache("newwest", cache_dir=str(tmp_path))
+    first = event_cache.record_run([monday, tuesday], "newwest", cache)
+    assert len(first["added"]) == 2 and not first["changed"] and not first["removed"]
+    utils.save_to_json([monday, tuesday], "newwest")
+
+    second = event_cache.record_run([dict(monday, openings="Full"), wednesday], "newwest", cache)
+    assert second["added"] == [wednesday]
+    assert second["removed"] == [tuesday]
+    assert [(change["eventID"], change["fields"]) for change in second["changed"]] == [("12345", ["openings"])]
+
+    with open(tmp_path / "newwest-drop-in-delta.json") as f:
+        assert json.load(f)["removed"] == [tuesday]
@@ -0,0 +1,48 @@
+# test_merge.py
+import merge
+
+
+def session(title, eventDate, eventTime, city="Burnaby", eventID=None, eventLink=None):
+    return {"title": title, "city": city, "eventID": eventID or title,
+            "eventLink": eventLink or f"https://example.com/{title}",
+            "eventDate": eventDate, "eventTime": eventTime}
+
+
+def titles(events):
+    return [event["title"] for event in events]
+
+
+def test_morning_sorts_before_afternoon():
+    events = [session("morning", "2025-05-05", "10:00 AM - 12:00 PM"),
+              session("afternoon", "2025-05-05", "3:30 PM - 5:30 PM")]
+    assert merge.sort_key(events[0]) < merge.sort_key(events[1])
+    merged = merge.merge_streams([[events[0]], [dict(events[1], city="New Westminster")]])
+    assert titles(merged) == ["morning", "afternoon"]
+
+
+def test_unknown_times_and_dates_go_last():
+    events = [session("no date", "Unknown", "7:00 PM - 9:00 PM"),
+              session("no time", "2025-05-05", "No time range"),
+              session("evening", "2025-05-05", "9:00 PM - 11:00 PM"),
+              session("next day", "2025-05-06", "8:00 AM - 9:00 AM")]
+    assert titles(merge.merge_streams([events])) == ["evening", "no time", "next day", "no date"]
+
+
+def test_unordered_input_is_sorted_before_merging():
+    burnaby = [session("late", "2025-05-07", "7:00 PM - 9:00 PM"),
+               session("early", "2025-05-05", "7:00 PM - 9:00 PM")]
+    newwest = [session("middle", "2025-05-06", "7:00 PM - 9:00 PM", city="New Westminster")]
+    assert titles(merge.merge_streams([burnaby, newwest])) == ["early", "middle", "late"]
+
+
+def test_occurrences_sharing_an_event_id_are_all_kept():
+    occurrences = [
+        session("monday", "2025-05-05", "7:00 PM - 9:00 PM", city="New Westminster", eventID="12345",
+                eventLink="https://example.com/class?occurrenceDate=20250505"),
+        session("tuesday", "2025-05-06", "7:00 PM - 9:00 PM", city="New Westminster", eventID="12345",
+                eventLink="https://example.com/class?occurrenceDate=20250506"),
+    ]
+    repeated = [dict(occurrences[0], title="repeat")]
+    other_city = [dict(occurrences[0], title="burnaby", city="Burnaby")]
+    merged = merge.merge_streams([occurrences, repeated, other_city])
+    assert sorted(titles(merged)) == ["burnaby", "monday", "tuesday"]
@@ -0,0 +1,74 @@
+# test_metrics.py
+import json
+
+import pytest
+
+import metrics
+
+
+@metrics.timer("parse", source="test")
+def parse(items):
+    return [item.upper() for item in items]
+
+
+def scrape(items):
+    with metrics.run("test"):
+        with metrics.timer("fetch"):
+            pages = list(items)
+        events = parse(pages)
+        metrics.count("events_scraped", len(events))
+        if not events:
+            raise RuntimeError("No matching volleyball events found")
+        return events
+
+
+def log_lines(capsys):
+    return [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+
+
+def read_textfile(textfile_dir):
+    return (textfile_dir / "spikeconnect_test.prom").read_text().splitlines()
+
+
+@pytest.fixture
+def textfile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "TEXTFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_successful_run_is_logged_and_exported(textfile_dir, capsys):
+    assert scrape(["a", "b"]) == ["A", "B"]
+
+    [finished] = log_lines(capsys)
+    assert (finished["event"], finished["job"], finished["ok"]) == ("run_finished", "test", True)
+    timers = {timer["stage"]: timer for timer in finished["timers"]}
+    assert timers["fetch"]["calls"] == 1
+    assert (timers["parse"]["calls"], timers["parse"]["source"]) == (1, "test")
+    assert finished["counters"] == [{"name": "events_scraped", "value": 2}]
+
+    lines = read_textfile(textfile_dir)
+    assert 'spikeconnect_stage_calls{job="test",stage="fetch"} 1' in lines
+    assert 'spikeconnect_stage_calls{job="test",stage="parse",source="test"} 1' in lines
+    assert 'spikeconnect_events_scraped{job="test"} 2' in lines
+    assert 'spikeconnect_run_success{job="test"} 1' in lines
+    assert any(line.startswith('spikeconnect_last_success_timestamp_seconds{job="test"} ') for line in lines)
+
+
+def test_failed_run_is_logged_and_keeps_the_last_success(textfile_dir, capsys):
+    scrape(["a"])
+    [last_success] = [line for line in read_textfile(textfile_dir) if line.startswith("spikeconnect_last_success")]
+    capsys.readouterr()
+
+    with pytest.raises(RuntimeError):
+        scrape([])
+
+    failed, finished = log_lines(capsys)
+    assert (failed["event"], failed["level"], failed["job"]) == ("run_failed", "error", "test")
+    assert "No matching volleyball events found" in failed["traceback"]
+    assert (finished["event"], finished["ok"]) == ("run_finished", False)
+    assert finished["counters"] == [{"name": "events_scraped", "value": 0}]
+
+    lines = read_textfile(textfile_dir)
+    assert 'spikeconnect_run_success{job="test"} 0' in lines
+    assert 'spikeconnect_events_scraped{job="test"} 0' in lines
+    assert last_success in lines
@@ -0,0 +1,35 @@
+# test_ndjson_sink.py
+import gzip
+import json
+
+import pytest
+
+from ndjson_sink import NDJSONSink
+
+
+def read_lines(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("name", ["sessions.ndjson", "sessions.ndjson.gz"])
+def test_restart_drops_what_was_written(tmp_path, name):
+    path = str(tmp_path / name)
+    with NDJSONSink(path) as sink:
+        sink.write_many([{"title": "api page 1"}, {"title": "api page 2"}])
+        sink.restart()
+        sink.write_many([{"title": "selenium"}])
+    assert read_lines(path) == [{"title": "selenium"}]
+
+
+def test_failed_run_keeps_the_previous_file(tmp_path):
+    path = str(tmp_path / "sessions.ndjson")
+    with NDJSONSink(path) as sink:
+        sink.write({"title": "last run"})
+    with pytest.raises(RuntimeError):
+        with NDJSONSink(path) as sink:
+            sink.write({"title": "partial"})
+            raise RuntimeError("scrape failed")
+    assert read_lines(path) == [{"title": "last run"}]
+    assert list(tmp_path.iterdir()) == [tmp_path / "sessions.ndjson"]
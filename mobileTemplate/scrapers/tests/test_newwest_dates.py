@@ -0,0 +1,69 @@
+# test_newwest_dates.py
+from datetime import date
+
+import pytest
+
+import newwest_drop_in_scraper as newwest
+
+
+def test_default_range_runs_to_the_end_of_the_month_after_next():
+    assert newwest.default_range(date(2025, 5, 14)) == (date(2025, 5, 14), date(2025, 7, 31))
+    assert newwest.default_range(date(2023, 12, 31)) == (date(2023, 12, 31), date(2024, 2, 29))
+    assert newwest.default_range(date(2025, 11, 1)) == (date(2025, 11, 1), date(2026, 1, 31))
+
+
+def test_month_shards_cover_the_range():
+    assert newwest.date_shards(date(2025, 5, 14), date(2025, 7, 3), "month") == [
+        (date(2025, 5, 14), date(2025, 5, 31)),
+        (date(2025, 6, 1), date(2025, 6, 30)),
+        (date(2025, 7, 1), date(2025, 7, 3)),
+    ]
+
+
+def test_week_shards_run_monday_to_sunday():
+    # 2025-05-14 is a Wednesday
+    assert newwest.date_shards(date(2025, 5, 14), date(2025, 5, 27), "week") == [
+        (date(2025, 5, 14), date(2025, 5, 18)),
+        (date(2025, 5, 19), date(2025, 5, 25)),
+        (date(2025, 5, 26), date(2025, 5, 27)),
+    ]
+
+
+def test_single_day_and_unsharded_ranges():
+    assert newwest.date_shards(date(2025, 5, 31), date(2025, 5, 31), "month") == [(date(2025, 5, 31), date(2025, 5, 31))]
+    assert newwest.date_shards(date(2025, 5, 14), date(2025, 7, 3), None) == [(date(2025, 5, 14), date(2025, 7, 3))]
+
+
+def test_unknown_shard_size():
+    with pytest.raises(ValueError):
+        newwest.date_shards(date(2025, 5, 14), date(2025, 7, 3), "year")
+
+
+def test_backwards_range_is_rejected():
+    with pytest.raises(ValueError):
+        newwest.date_range(date(2025, 7, 3), date(2025, 5, 14))
+    with pytest.raises(ValueError):
+        newwest.load_sessions(date(2025, 7, 3), date(2025, 5, 14))
+    with pytest.raises(SystemExit):
+        newwest.main(["--start", "2025-07-03", "--end", "2025-05-14"])
+
+
+def test_calendar_value_counts_months_from_zero():
+    assert newwest.calendar_value(date(2025, 1, 31)) == "2025/0/31"
+
+
+def test_partial_scrape_keeps_saved_sessions_outside_the_range(tmp_path, monkeypatch):
+    today = date.today()
+    saved = [
+        {"eventID": "1", "eventLink": "past", "eventDate": date.fromordinal(today.toordinal() - 1).isoformat()},
+        {"eventID": "2", "eventLink": "inside", "eventDate": today.isoformat()},
+        {"eventID": "3", "eventLink": "rescraped", "eventDate": date.fromordinal(today.toordinal() + 30).isoformat()},
+        {"eventID": "4", "eventLink": "later", "eventDate": date.fromordinal(today.toordinal() + 30).isoformat()},
+        {"eventID": "5", "eventLink": "undated", "eventDate": "Unknown"},
+    ]
+    monkeypatch.setattr(newwest.utils, "DATA_DIR", str(tmp_path))
+    newwest.utils.save_to_json(saved, "newwest")
+
+    end = date.fromordinal(today.toordinal() + 2)
+    kept = newwest.saved_outside(today, end, {"rescraped"})
+    assert [event["eventLink"] for event in kept] == ["later", "undated"]
@@ -0,0 +1,15 @@
+# test_normalize.py
+import normalize
+
+
+def test_ambiguous_slash_date_is_month_first_regardless_of_history():
+    assert normalize.standardize_date("04/12/2025", source="history") == "2025-04-12"
+    assert normalize.standardize_date("25/12/2025", source="history") == "2025-12-25"
+    assert normalize.standardize_date("04/12/2025", source="history") == "2025-04-12"
+
+
+def test_remembered_format_still_parses_unambiguous_dates():
+    assert normalize.standardize_date("12-Apr-2025", source="newwest-test") == "2025-04-12"
+    assert normalize.standardize_date("Apr 13, 2025", source="newwest-test") == "2025-04-13"
+    assert normalize.standardize_date("2025-04-14", source="newwest-test") == "2025-04-14"
+    assert normalize.standardize_date("not a date", source="newwest-test") == "not a date"
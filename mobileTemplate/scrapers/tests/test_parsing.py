@@ -0,0 +1,28 @@
+# test_parsing.py
+import os
+
+import pytest
+
+import parsing
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+
+def read_fixture(*parts):
+    with open(os.path.join(FIXTURES, *parts), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("parse, page", [
+    (parsing.parse_burnaby_cards, ("burnaby", "list.html")),
+    (parsing.parse_newwest_sessions, ("newwest", "list.html")),
+])
+@pytest.mark.parametrize("backend", ["lxml", "selectolax"])
+def test_backends_match_html_parser(backend, parse, page):
+    if backend not in parsing.available_backends():
+        pytest.skip(f"{backend} is not installed")
+    page_html = read_fixture(*page)
+
+    expected = parse(page_html, backend="html.parser")
+    assert expected
+    assert parse(page_html, backend=backend) == expected
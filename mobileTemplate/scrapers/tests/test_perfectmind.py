@@ -0,0 +1,87 @@
+# test_perfectmind.py
+import os
+
+import pytest
+
+import perfectmind
+import newwest_drop_in_scraper
+
+DETAILS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "newwest", "details")
+SAVED_PAGE = "b9d67890-6495-858c-42f9-f7459c728046-20250529.html"
+
+PAGE_WITHOUT_FEE = """
+<div class="bm-course-restrictions">
+  <div class="row"><div class="first-column">Age Restrictions</div><div class="second-column">16+</div></div>
+</div>
+<span aria-label="Event date 29-May-2025">29-May-2025</span>
+<span aria-label="Event time 6:30 PM - 8:30 PM">6:30 PM - 8:30 PM</span>
+"""
+
+
+def read_details(name):
+    with open(os.path.join(DETAILS_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, timeout=None):
+        return FakeResponse(self.pages[url])
+
+
+class FakeDriver:
+    """A browser whose details tab never renders any of the fields"""
+    def __init__(self):
+        self.window_handles = ["list"]
+
+    def execute_script(self, script):
+        self.window_handles.append("details")
+
+    def find_element(self, by, value):
+        raise LookupError(f"no element matches {value}")
+
+    def close(self):
+        self.window_handles.pop()
+
+    @property
+    def switch_to(self):
+        return self
+
+    def window(self, handle):
+        pass
+
+
+def test_saved_details_page_is_parsed():
+    details = perfectmind.parse_details_page(read_details(SAVED_PAGE))
+    assert details == ("16+", "$7.14", "2025-05-29", "6:30 PM - 8:30 PM")
+
+
+def test_missing_fields_raise():
+    with pytest.raises(ValueError):
+        perfectmind.parse_details_page(PAGE_WITHOUT_FEE)
+
+
+def test_unparsable_pages_are_left_for_the_browser():
+    session = FakeSession({"good": read_details(SAVED_PAGE), "bad": PAGE_WITHOUT_FEE})
+    results = {}
+
+    fetched = perfectmind.fetch_details({"b9d67890": "good", "741d453e": "bad"}, session=session, workers=2,
+                                        on_result=results.__setitem__)
+    assert fetched == results == {"b9d67890": ("16+", "$7.14", "2025-05-29", "6:30 PM - 8:30 PM")}
+
+
+def test_browser_fallback_marks_missing_fields_unknown():
+    pytest.importorskip("selenium")
+    driver = FakeDriver()
+    assert newwest_drop_in_scraper.get_details_and_return(driver, "bad") == ("Unknown",) * 4
+    assert driver.window_handles == ["list"]
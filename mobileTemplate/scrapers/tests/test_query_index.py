@@ -0,0 +1,43 @@
+# test_query_index.py
+from datetime import datetime
+
+import query_index
+
+EVENTS = [
+    {"title": "Drop-in Volleyball", "city": "Burnaby", "level": "Beginner", "venueType": "Indoor",
+     "dayOfWeek": "Monday", "status": "Open", "eventDate": "2025-05-05", "eventTime": "7:00 PM - 9:00 PM"},
+    {"title": "Volleyball League", "city": "New Westminster", "level": "Intermediate", "venueType": "Indoor",
+     "dayOfWeek": "Tuesday", "status": "Open", "eventDate": "2025-05-06", "eventTime": "6:00 PM - 8:00 PM"},
+    {"title": "Beach Volleyball", "city": "Burnaby", "level": "Beginner", "venueType": "Indoor",
+     "dayOfWeek": "Monday", "status": "Full", "eventDate": "2025-05-12", "eventTime": "7:00 PM - 9:00 PM"},
+    {"title": "Volleyball TBA", "city": "Burnaby", "level": "Beginner", "venueType": "Indoor",
+     "dayOfWeek": None, "status": "Open", "eventDate": "Unknown", "eventTime": None},
+]
+
+
+def test_queries_match_a_scan_and_outlive_close(tmp_path):
+    path = query_index.write_index_binary(query_index.build_index(EVENTS), str(tmp_path / "sessions.spki"))
+    index = query_index.QueryIndex(path)
+    volley = index.search("volley")
+    beginner = index.field("level", "Beginner")
+    may = index.search("2025-05")
+    index.close()
+
+    assert list(volley) == [0, 1, 2, 3]
+    assert list(beginner) == [i for i, event in enumerate(EVENTS) if event["level"] == "Beginner"]
+    assert may == [0, 1, 2]
+
+
+def test_related_and_featured(tmp_path):
+    path = query_index.write_index_binary(query_index.build_index(EVENTS), str(tmp_path / "sessions.spki"))
+    with query_index.QueryIndex(path) as index:
+        assert index.related("Beginner", "Indoor", "Burnaby", exclude=0) == [2, 3]
+        assert index.featured(limit=2, now=datetime(2025, 5, 6).timestamp()) == [1, 2]
+
+
+def test_featured_skips_sessions_without_a_start_time(tmp_path):
+    events = EVENTS + [dict(EVENTS[1], eventTime="TBA"), dict(EVENTS[1], eventTime="5:00 PM - 7:00 PM")]
+    path = query_index.write_index_binary(query_index.build_index(events), str(tmp_path / "sessions.spki"))
+    with query_index.QueryIndex(path) as index:
+        assert index.featured(now=datetime(2025, 5, 6).timestamp()) == [5, 1, 2]
+        assert 4 in index.search("2025-05-06")
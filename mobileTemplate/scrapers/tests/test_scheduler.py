@@ -0,0 +1,104 @@
+# test_scheduler.py
+import json
+from datetime import date, datetime
+
+import pytest
+
+import scheduler
+
+NOW = datetime(2025, 5, 14, 12, 0).timestamp()
+HOUR = 3600
+
+
+def session(hours_from_now):
+    start = datetime.fromtimestamp(NOW + hours_from_now * HOUR)
+    return {"eventID": str(hours_from_now), "eventDate": start.strftime("%Y-%m-%d"),
+            "eventTime": start.strftime("%I:%M %p") + " - 11:59 PM"}
+
+
+def test_count_changes_splits_near_and_far():
+    delta = {
+        "added": [session(2), session(100)],
+        "changed": [{"event": session(47)}, {"event": session(49)}],
+        "removed": [session(-5), session(10)],  # the past session just dropped off the list
+    }
+    assert scheduler.count_changes(delta, NOW) == (3, 2)
+
+
+def test_first_run_only_clamps_the_interval():
+    state = scheduler.SourceState("burnaby", interval=10)
+    assert state.succeeded({"added": [session(1)] * 50}, NOW) == (50, 0)
+    assert state.interval == scheduler.MIN_INTERVAL
+    assert state.near_rate is None
+    assert state.next_run == NOW + scheduler.MIN_INTERVAL
+
+
+def test_interval_moves_towards_target_at_most_max_step():
+    state = scheduler.SourceState("burnaby", interval=1200, last_run=NOW - HOUR)
+    state.succeeded({"added": [session(1)]}, NOW)
+    # 1 near change per hour weighs 3: the target is 2 / 3 hours = 2400 s, within 2 x 1200
+    assert state.near_rate == 1.0 and state.far_rate == 0.0
+    assert state.interval == pytest.approx(2400)
+
+    quiet = scheduler.SourceState("burnaby", interval=1200, last_run=NOW - HOUR)
+    quiet.succeeded({}, NOW)
+    assert quiet.interval == 2400  # no changes: back off, one MAX_STEP at a time
+
+    busy = scheduler.SourceState("burnaby", interval=1200, last_run=NOW - HOUR)
+    busy.succeeded({"added": [session(1)] * 100}, NOW)
+    assert busy.interval == 600  # speeding up is capped the same way
+    busy.last_run = NOW - HOUR
+    busy.succeeded({"added": [session(1)] * 100}, NOW)
+    assert busy.interval == scheduler.MIN_INTERVAL
+
+
+def test_rates_are_smoothed():
+    state = scheduler.SourceState("burnaby", interval=1200, near_rate=4.0, far_rate=2.0, last_run=NOW - HOUR)
+    state.succeeded({"added": [session(100)] * 4}, NOW)
+    assert (state.near_rate, state.far_rate) == (2.0, 3.0)
+
+
+def test_windows_count_only_their_own_changes():
+    delta = {"added": [session(100)] * 20}
+    near = scheduler.SourceState("newwest:near", interval=1200, last_run=NOW - HOUR)
+    far = scheduler.SourceState("newwest:far", interval=1200, last_run=NOW - HOUR)
+    near.succeeded(delta, NOW)
+    far.succeeded(delta, NOW)
+    assert near.interval == 2400  # far-future changes don't speed up the near-term job
+    assert far.interval == 600
+
+
+def test_failures_back_off_exponentially():
+    state = scheduler.SourceState("burnaby")
+    for expected in (300, 600, 1200, 2400, 4800, 7200, 7200):
+        state.failed(NOW)
+        assert state.next_run - NOW == expected
+
+
+def test_jobs_and_options():
+    assert scheduler.jobs_for(["burnaby", "newwest"]) == ["burnaby", "newwest:near", "newwest:far"]
+    assert scheduler.job_options("newwest:near", NOW) == {"start": date(2025, 5, 14), "end": date(2025, 5, 16),
+                                                         "partial": True}
+    assert scheduler.job_options("newwest:far", NOW) == {}
+    assert scheduler.job_options("burnaby", NOW) == {}
+
+
+def test_due_jobs_skip_busy_cities():
+    states = {job: scheduler.SourceState(job, next_run=NOW - i) for i, job in
+              enumerate(scheduler.jobs_for(["burnaby", "newwest"]))}
+    assert scheduler.due_jobs(states, set(), NOW) == ["newwest:far", "newwest:near", "burnaby"]
+    assert scheduler.due_jobs(states, {"newwest"}, NOW) == ["burnaby"]
+
+
+def test_state_from_another_version_still_loads(tmp_path):
+    path = tmp_path / "scheduler-state.json"
+    path.write_text(json.dumps({
+        "burnaby": {"interval": 1800, "failures": 2, "rate": 0.5},
+        "newwest:near": None,
+    }))
+    states = scheduler.load_state(["burnaby", "newwest:near", "newwest:far"], str(path))
+    assert (states["burnaby"].interval, states["burnaby"].failures) == (1800, 2)
+    assert states["newwest:near"].to_dict() == scheduler.SourceState("newwest:near").to_dict()
+
+    path.write_text("[]")
+    assert scheduler.load_state(["burnaby"], str(path))["burnaby"].failures == 0
@@ -0,0 +1,90 @@
+# test_sqlite_sink.py
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlite_sink
+
+SCRAPERS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def occurrence(link, date, time):
+    return {"eventID": "12345", "title": "Drop-in Volleyball", "location": "Queensborough",
+            "city": "New Westminster", "eventLink": link, "category": "Drop-in", "level": "Intermediate",
+            "ages": "19+", "openings": "4", "status": "Open", "venueType": "Indoor",
+            "eventDate": date, "eventTime": time, "fee": "$5.00"}
+
+
+def test_each_occurrence_gets_its_own_row(tmp_path, monkeypatch):
+    monkeypatch.chdir(SCRAPERS_DIR)  # the schema path is relative to the scrapers directory
+    events = [
+        occurrence("https://example.com/class?occurrence=2025-05-05T10:00", "2025-05-05", "10:00 AM - 12:00 PM"),
+        occurrence("https://example.com/class?occurrence=2025-05-05T19:00", "2025-05-05", "7:00 PM - 9:00 PM"),
+        occurrence("https://example.com/class?occurrence=a", "Unknown", None),
+        occurrence("https://example.com/class?occurrence=b", "Unknown", None),
+    ]
+    db_path = str(tmp_path / "volleyball.db")
+    sqlite_sink.save_to_sqlite(events, "newwest", db_path)
+    sqlite_sink.save_to_sqlite(events, "newwest", db_path)
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT occurrence_key, event_id FROM sessions ORDER BY occurrence_key;").fetchall()
+    conn.close()
+    assert rows == sorted((event["eventLink"], "12345") for event in events)
+
+
+def test_database_keyed_on_event_id_is_migrated(tmp_path, monkeypatch):
+    monkeypatch.chdir(SCRAPERS_DIR)
+    db_path = str(tmp_path / "volleyball.db")
+    link = "https://example.com/class?occurrence=2025-05-05T10:00"
+
+    # The earlier layout: the schema's UNIQUE event_id holding the occurrence link
+    conn = sqlite3.connect(db_path)
+    with open(sqlite_sink.SCHEMA_FILE) as f:
+        conn.executescript(f.read())
+    conn.execute("ALTER TABLE sessions ADD COLUMN city TEXT;")
+    conn.execute("INSERT INTO sessions (event_id, title, city) VALUES (?, 'Drop-in Volleyball', 'New Westminster');", (link,))
+    conn.execute("INSERT INTO user_registrations (user_id, session_id) VALUES (1, 1);")
+    conn.commit()
+    conn.close()
+
+    sqlite_sink.save_to_sqlite([occurrence(link, "2025-05-05", "10:00 AM - 12:00 PM"),
+                                occurrence(link + "x", "2025-05-06", "10:00 AM - 12:00 PM")], "newwest", db_path)
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT occurrence_key, event_id FROM sessions ORDER BY id;").fetchall()
+    registered = conn.execute("""
+        SELECT s.occurrence_key FROM user_registrations r JOIN sessions s ON s.id = r.session_id;
+    """).fetchall()
+    conn.close()
+    assert rows == [(link, "12345"), (link + "x", "12345")]
+    assert registered == [(link,)]
+
+
+def test_a_concurrent_writer_is_waited_for(tmp_path, monkeypatch):
+    monkeypatch.chdir(SCRAPERS_DIR)
+    db_path = str(tmp_path / "volleyball.db")
+    sqlite_sink.save_to_sqlite([], db_path=db_path)
+
+    # Another city's run is mid-transaction, adding lookup names this run needs too
+    other = sqlite3.connect(db_path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE;")
+    other.execute("INSERT INTO categories (name) VALUES ('Drop-in');")
+    other.execute("INSERT INTO venues (name, venue_type) VALUES ('Queensborough', 'Indoor');")
+    with ThreadPoolExecutor(1) as pool:
+        future = pool.submit(sqlite_sink.save_to_sqlite, [occurrence("https://example.com/a", "2025-05-05", None)],
+                             "newwest", db_path)
+        time.sleep(0.5)
+        other.execute("COMMIT;")
+        future.result()
+
+    counts = [other.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0] for table in ("sessions", "venues", "categories")]
+    other.close()
+    assert counts == [1, 1, 1]
+
+
+def test_database_errors_dont_fail_the_scrape(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # no ../assets/data here: neither the schema nor the database can be opened
+    events = [occurrence("https://example.com/class?occurrence=a", "2025-05-05", None)]
+    assert sqlite_sink.try_save_to_sqlite(events, "newwest") is False
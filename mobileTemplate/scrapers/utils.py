@@ -1,84 +1,54 @@
 import json
 import os
-from datetime import datetime
+from contextlib import contextmanager
 
-def standardize_date(date_str):
+from event_record import to_json
+
+# Field normalizers live in normalize.py (memoized, precompiled); re-exported here under their original names
+from normalize import (
+    standardize_date,
+    get_day_of_week,
+    get_venue_type_from_location,
+    get_status_from_openings,
+    get_level_from_title,
+    normalize_events,
+)
+
+# Where the scrapers write their per-city JSON files (relative to the working directory)
+DATA_DIR = "../assets/data"
+
+@contextmanager
+def atomic_open(file_path, mode="w", **kwargs):
     """
-    Convert various date formats to a standardized ISO format (YYYY-MM-DD).
-    This makes date parsing and comparison much easier in the frontend.
+    Write to a temp file next to `file_path` and, once the block finishes, fsync it and rename it
+    over `file_path`. Readers see either the old file or the complete new one, never a partial write.
     """
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    f = open(tmp_path, mode, **kwargs)
     try:
-        # Try different date formats
-        formats = [
-            "%B %d, %Y",  # April 11, 2025
-            "%b %d, %Y",  # Apr 12, 2025
-            "%d-%b-%Y",   # 12-Apr-2025
-            "%Y-%m-%d",   # 2025-04-12
-            "%m/%d/%Y",   # 04/12/2025
-            "%d/%m/%Y"    # 12/04/2025
-        ]
-        
-        for fmt in formats:
-            try:
-                date_obj = datetime.strptime(date_str, fmt)
-                return date_obj.strftime("%Y-%m-%d")  # Returns ISO format (YYYY-MM-DD)
-            except ValueError:
-                continue
-                
-        # If none of the formats work, raise an exception
-        raise ValueError(f"Could not parse date: {date_str}")
-        
-    except Exception as e:
-        print(f"Error standardizing date: {e}")
-        return date_str  # Return original string if parsing fails
-
-def get_day_of_week(date_str):
-    try:
-        # First standardize the date
-        iso_date = standardize_date(date_str)
-        
-        # Parse the ISO date
-        date_obj = datetime.strptime(iso_date, "%Y-%m-%d")
-        return date_obj.strftime("%A")  # Returns full day name (Monday, Tuesday, etc.)
-        
-    except Exception as e:
-        print(f"Error getting day of week: {e}")
-        return "Unknown" 
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+    except BaseException:
+        f.close()
+        os.remove(tmp_path)
+        raise
+    f.close()
+    os.replace(tmp_path, file_path)
 
 def save_to_json(events, city):
-    directory = "../assets/data"
-    file_path = os.path.join(directory, f'{city}-drop-in-sessions.json')
+    file_path = os.path.join(DATA_DIR, f'{city}-drop-in-sessions.json')
     
-    with open(file_path, "w") as f:
-        json.dump(events, f, indent=4)
+    with atomic_open(file_path) as f:
+        json.dump(events, f, indent=4, default=to_json)
     
     print(f"Data saved successfully in {file_path}")
 
-def get_venue_type_from_location(location):
-    location_lower = location.lower()
-    if "centre" in location_lower or "complex" in location_lower or "gymnasium" in location_lower or "gym" in location_lower:
-        return "Indoor"
-    elif "beach" in location_lower or "sand" in location_lower in location_lower or "banks" in location_lower:
-        return "Beach"
-    elif "grass" in location_lower:
-        return "Grass"
-    else:
-        return "Not Specified"
-    
-def get_status_from_openings(openings):
-    openings = openings.lower()
-    if openings == "0" or "full" in openings:
-        return "Full"
-    else:
-        return "Open"
-    
-def get_level_from_title(title):
-    title_lower = title.lower()
-    if "beginner" in title_lower:
-        return "Beginner"
-    elif "intermediate" in title_lower:
-        return "Intermediate"
-    elif "advanced" in title_lower:
-        return "Advanced"
-    else:
-        return "All Levels"
+def load_from_json(city):
+    """Return the events a city's scraper saved last time (empty list if there are none)"""
+    file_path = os.path.join(DATA_DIR, f'{city}-drop-in-sessions.json')
+    try:
+        with open(file_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []